@@ -0,0 +1,97 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.functional import SimpleLazyObject
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+from users.models import User
+from .tokens import (CLAIMS_VERSION_CLAIM, CLAIMS_VERSION_KEY, ROLE_CLAIMS,
+                     cache_claims_version)
+
+USER_CACHE_KEY = 'user:{}'
+
+
+def invalidate_user(user_id):
+    cache.delete(USER_CACHE_KEY.format(user_id))
+
+
+def revoke_role_claims(user_id):
+    cache.delete(CLAIMS_VERSION_KEY.format(user_id))
+
+
+def get_claims_version(user_id):
+    version = cache.get(CLAIMS_VERSION_KEY.format(user_id))
+    if version is None:
+        # Кеш локален для процесса и может быть вытеснен, поэтому
+        # источником истины остаётся версия в базе.
+        version = User.objects.filter(pk=user_id).values_list(
+            'claims_version', flat=True
+        ).first()
+        if version is not None:
+            cache_claims_version(user_id, version)
+    return version
+
+
+def has_valid_role_claims(token):
+    if not all(
+        claim in token for claim in (*ROLE_CLAIMS, CLAIMS_VERSION_CLAIM)
+    ):
+        return False
+    return token[CLAIMS_VERSION_CLAIM] == get_claims_version(
+        token[api_settings.USER_ID_CLAIM]
+    )
+
+
+class TokenRoleUser(SimpleLazyObject):
+    is_authenticated = True
+    is_anonymous = False
+    is_admin = User.is_admin
+    is_moderator = User.is_moderator
+
+    def __init__(self, token, load_user):
+        self.__dict__['token'] = token
+        super().__init__(load_user)
+
+    @property
+    def pk(self):
+        return self.token[api_settings.USER_ID_CLAIM]
+
+    id = pk
+
+    @property
+    def role(self):
+        return self.token['role']
+
+    @property
+    def is_staff(self):
+        return self.token['is_staff']
+
+    @property
+    def is_superuser(self):
+        return self.token['is_superuser']
+
+    @property
+    def is_active(self):
+        return self.token['is_active']
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        if has_valid_role_claims(validated_token):
+            return TokenRoleUser(
+                validated_token,
+                partial(self.get_cached_user, validated_token)
+            )
+        return self.get_cached_user(validated_token)
+
+    def get_cached_user(self, validated_token):
+        key = USER_CACHE_KEY.format(
+            validated_token.get(api_settings.USER_ID_CLAIM)
+        )
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(validated_token)
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user
@@ -0,0 +1,45 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .versions import get_versions
+
+RESPONSE_CACHE_ALIAS = 'responses'
+RESPONSE_KEY = 'response:{}'
+
+
+def get_response_cache():
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def get_request_signature(request, versions):
+    params = sorted(
+        (key, value)
+        for key, values in request.GET.lists()
+        for value in values
+    )
+    signature = repr((
+        request.path,
+        params,
+        request.META.get('HTTP_ACCEPT', ''),
+        versions,
+    ))
+    return hashlib.md5(signature.encode()).hexdigest()
+
+
+def get_response_key(request, scopes):
+    versions, _ = get_versions(scopes)
+    return RESPONSE_KEY.format(get_request_signature(request, versions))
+
+
+def get_cached_response(key):
+    return get_response_cache().get(key)
+
+
+def cache_response(key, response):
+    get_response_cache().set(
+        key,
+        (response.status_code, response.content, list(response.items())),
+        settings.RESPONSE_CACHE_TIMEOUT,
+    )
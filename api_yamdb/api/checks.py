@@ -0,0 +1,19 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.checks import Warning, register
+
+from .versions import VERSION_CACHE_ALIAS
+
+
+@register('caches', deploy=True)
+def check_shared_version_cache(app_configs, **kwargs):
+    if not isinstance(caches[VERSION_CACHE_ALIAS], LocMemCache):
+        return []
+    return [
+        Warning(
+            'Счётчики версий хранятся в локальной памяти процесса: при '
+            'нескольких процессах каждый выдаёт свои ETag и ключи кеша.',
+            hint='Задайте RESPONSE_CACHE_BACKEND=file или redis.',
+            id='api.W001',
+        )
+    ]
@@ -2,20 +2,18 @@ import django_filters
 from django_filters import FilterSet
 
 from reviews.models import Title
+from reviews.search import filter_titles_by_name
 
 
 class TitleFilter(FilterSet):
     category = django_filters.CharFilter(
         field_name='category__slug',
-        lookup_expr='contains'
     )
     genre = django_filters.CharFilter(
         field_name='genre__slug',
-        lookup_expr='contains'
     )
     name = django_filters.CharFilter(
-        field_name='name',
-        lookup_expr='contains'
+        method='filter_name',
     )
 
     class Meta:
@@ -26,3 +24,6 @@ class TitleFilter(FilterSet):
             'name',
             'year',
         )
+
+    def filter_name(self, queryset, name, value):
+        return filter_titles_by_name(queryset, value)
@@ -0,0 +1,376 @@
+import json
+import math
+import multiprocessing
+import platform
+import random
+import statistics
+import time
+import tracemalloc
+from itertools import count
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from api.tokens import RoleAccessToken
+from reviews.database import get_connection_stats
+from reviews.models import Comment, Review, Title
+from users.models import User
+
+BENCHMARK_ADMIN = 'benchmark_admin'
+BENCHMARK_USER = 'benchmark_user'
+CONFIRMATION_CODE = '12345'
+
+
+def percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(percent / 100 * len(ordered)) - 1)]
+
+
+def run_mixed_worker(kind, reads, write_url, authorization, duration, seed):
+    client = Client(HTTP_AUTHORIZATION=authorization)
+    generator = random.Random(seed)
+    timings = []
+    errors = []
+    deadline = time.perf_counter() + duration
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if kind == 'write':
+                    response = client.post(
+                        write_url, data={'text': 'Бенчмарк'}
+                    )
+                else:
+                    response = client.get(generator.choice(reads))
+            except Exception as error:
+                errors.append(type(error).__name__)
+                continue
+            if response.status_code >= 400:
+                errors.append(str(response.status_code))
+                continue
+            timings.append(time.perf_counter() - started)
+    finally:
+        connections.close_all()
+    return kind, timings, errors
+
+
+class Command(BaseCommand):
+    help = ('Измеряет задержку, число SQL-запросов и выделяемую память '
+            'для эндпоинтов API на текущей базе данных.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50)
+        parser.add_argument('--warmup', type=int, default=3)
+        parser.add_argument(
+            '--endpoint', action='append',
+            help='Имя эндпоинта, можно указать несколько раз.'
+        )
+        parser.add_argument('--output', help='Файл для результатов в JSON.')
+        parser.add_argument(
+            '--baseline', help='Результаты прошлого запуска для сравнения.'
+        )
+        parser.add_argument(
+            '--readers', type=int, default=0,
+            help='Число процессов, которые только читают.'
+        )
+        parser.add_argument(
+            '--writers', type=int, default=0,
+            help='Число процессов, которые только пишут.'
+        )
+        parser.add_argument('--duration', type=float, default=5.0)
+        parser.add_argument(
+            '--profile', action='append',
+            help='Профиль настроек SQLite для смешанной нагрузки, по '
+                 'умолчанию все из SQLITE_PRAGMA_PROFILES.'
+        )
+
+    def get_client(self, username, role):
+        user, _ = User.objects.get_or_create(
+            username=username,
+            defaults={'email': f'{username}@yamdb.fake', 'role': role},
+        )
+        return user, Client(
+            HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+        )
+
+    def get_endpoints(self):
+        title = Title.objects.order_by('id').first()
+        comment = Comment.objects.select_related('review').order_by(
+            'id'
+        ).first()
+        if title is None or comment is None:
+            raise CommandError(
+                'В базе нет данных, сначала выполните seed_data.'
+            )
+        review = comment.review
+        anonymous = Client()
+        admin, admin_client = self.get_client(BENCHMARK_ADMIN, 'admin')
+        user, user_client = self.get_client(BENCHMARK_USER, 'user')
+        signups = count()
+        run = int(time.time())
+        reviews_url = f'/api/v1/titles/{review.title_id}/reviews/'
+        comments_url = f'{reviews_url}{review.id}/comments/'
+
+        def signup_data():
+            username = f'bench_{run}_{next(signups)}'
+            return {'username': username, 'email': f'{username}@yamdb.fake'}
+
+        def reset_confirmation_code():
+            User.objects.filter(pk=user.pk).update(
+                confirmation_code=CONFIRMATION_CODE
+            )
+
+        return (
+            ('titles-list', 'get', '/api/v1/titles/', anonymous),
+            ('titles-list-auth', 'get', '/api/v1/titles/', user_client),
+            ('titles-list-cursor', 'get', '/api/v1/titles/?cursor=',
+             anonymous),
+            ('titles-filter-name', 'get',
+             f'/api/v1/titles/?name={title.name[:5]}', anonymous),
+            ('title-detail', 'get', f'/api/v1/titles/{title.id}/',
+             anonymous),
+            ('categories-list', 'get', '/api/v1/categories/', anonymous),
+            ('genres-list', 'get', '/api/v1/genres/', anonymous),
+            ('reviews-list', 'get', reviews_url, anonymous),
+            ('review-detail', 'get', f'{reviews_url}{review.id}/',
+             anonymous),
+            ('comments-list', 'get', comments_url, anonymous),
+            ('comment-detail', 'get', f'{comments_url}{comment.id}/',
+             anonymous),
+            ('search', 'get', '/api/v1/search/?q=фильм', anonymous),
+            ('users-list', 'get', '/api/v1/users/', admin_client),
+            ('users-me', 'get', '/api/v1/users/me/', user_client),
+            ('auth-signup', 'post', '/api/v1/auth/signup/', anonymous,
+             signup_data),
+            ('auth-token', 'post', '/api/v1/auth/token/', anonymous,
+             lambda: {
+                 'username': user.username,
+                 'confirmation_code': CONFIRMATION_CODE,
+             },
+             reset_confirmation_code),
+        )
+
+    def request(self, client, method, url, data):
+        # Тестовый клиент не закрывает устаревшие соединения, поэтому
+        # CONN_MAX_AGE применяется так же, как в обработчике WSGI.
+        close_old_connections()
+        response = getattr(client, method)(url, data=data)
+        if response.status_code >= 400:
+            raise CommandError(
+                f'{method.upper()} {url}: {response.status_code} '
+                f'{response.content[:200]!r}'
+            )
+        return response
+
+    def measure(self, name, method, url, client, data=None, prepare=None):
+        def call():
+            if prepare:
+                prepare()
+            payload = data() if data else None
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = self.request(client, method, url, payload)
+                elapsed = time.perf_counter() - started
+            return elapsed, len(queries), len(response.content)
+
+        for _ in range(self.warmup):
+            call()
+        timings, queries, sizes = zip(
+            *(call() for _ in range(self.repeat))
+        )
+
+        if prepare:
+            prepare()
+        payload = data() if data else None
+        tracemalloc.start()
+        self.request(client, method, url, payload)
+        _, allocated = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        return {
+            'name': name,
+            'method': method.upper(),
+            'url': url,
+            'p50_ms': round(percentile(timings, 50) * 1000, 3),
+            'p99_ms': round(percentile(timings, 99) * 1000, 3),
+            'mean_ms': round(statistics.mean(timings) * 1000, 3),
+            'queries': max(queries),
+            'response_bytes': max(sizes),
+            'allocated_bytes': allocated,
+        }
+
+    def get_mixed_targets(self):
+        comment = Comment.objects.select_related('review').order_by(
+            'id'
+        ).first()
+        if comment is None:
+            raise CommandError(
+                'В базе нет данных, сначала выполните seed_data.'
+            )
+        review = comment.review
+        title_url = f'/api/v1/titles/{review.title_id}/'
+        # Чтения идут с токеном, чтобы не попадать в кеш ответов.
+        _, client = self.get_client(BENCHMARK_USER, 'user')
+        return (
+            ('/api/v1/titles/', title_url, f'{title_url}reviews/'),
+            f'{title_url}reviews/{review.id}/comments/',
+            client.defaults['HTTP_AUTHORIZATION'],
+        )
+
+    def apply_sqlite_profile(self, pragmas):
+        # Режим журнала хранится в файле и меняется, только пока других
+        # соединений нет, поэтому профиль применяется до запуска процессов.
+        connections.close_all()
+        settings.SQLITE_PRAGMAS = pragmas
+        connection.ensure_connection()
+        connections.close_all()
+
+    def measure_mixed(self, profile, targets, readers, writers, duration):
+        self.apply_sqlite_profile(settings.SQLITE_PRAGMA_PROFILES[profile])
+        kinds = ['read'] * readers + ['write'] * writers
+        with multiprocessing.get_context('fork').Pool(len(kinds)) as pool:
+            outcomes = pool.starmap(run_mixed_worker, [
+                (kind, *targets, duration, seed)
+                for seed, kind in enumerate(kinds)
+            ])
+
+        errors = [error for _, _, failed in outcomes for error in failed]
+        result = {
+            'profile': profile,
+            'pragmas': settings.SQLITE_PRAGMAS,
+            'readers': readers,
+            'writers': writers,
+            'duration_s': duration,
+            'errors': len(errors),
+            'error_types': sorted(set(errors)),
+        }
+        for kind in ('read', 'write'):
+            values = [
+                value for outcome_kind, timings, _ in outcomes
+                if outcome_kind == kind for value in timings
+            ]
+            result[f'{kind}s'] = len(values)
+            result[f'{kind}_rps'] = round(len(values) / duration, 1)
+            for percent in (50, 99):
+                result[f'{kind}_p{percent}_ms'] = round(
+                    percentile(values, percent) * 1000, 3
+                ) if values else None
+        return result
+
+    def run_mixed(self, options):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            raise CommandError(
+                'Смешанной нагрузке нужна файловая база: процессы '
+                'открывают к ней собственные соединения.'
+            )
+        targets = self.get_mixed_targets()
+        original = settings.SQLITE_PRAGMAS
+        try:
+            mixed = [
+                self.measure_mixed(
+                    profile, targets, options['readers'],
+                    options['writers'], options['duration'],
+                )
+                for profile in (
+                    options['profile'] or settings.SQLITE_PRAGMA_PROFILES
+                )
+            ]
+        finally:
+            self.apply_sqlite_profile(original)
+        for result in mixed:
+            self.stderr.write(
+                f'{"mixed-" + result["profile"]:<20} '
+                f'чтений {result["read_rps"]:>8.1f}/с  '
+                f'записей {result["write_rps"]:>8.1f}/с  '
+                f'ошибок {result["errors"]:>5}'
+            )
+        return mixed
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+        self.warmup = options['warmup']
+        endpoints = self.get_endpoints()
+        if options['endpoint']:
+            endpoints = [
+                endpoint for endpoint in endpoints
+                if endpoint[0] in options['endpoint']
+            ]
+
+        results = []
+        for endpoint in endpoints:
+            result = self.measure(*endpoint)
+            results.append(result)
+            self.stderr.write(
+                f'{result["name"]:<20} p50 {result["p50_ms"]:>9.3f} мс  '
+                f'p99 {result["p99_ms"]:>9.3f} мс  '
+                f'запросов {result["queries"]:>3}  '
+                f'память {result["allocated_bytes"]:>9}'
+            )
+        mixed = None
+        if options['readers'] or options['writers']:
+            mixed = self.run_mixed(options)
+
+        report = json.dumps(
+            {
+                'meta': {
+                    'created': timezone.now().isoformat(),
+                    'python': platform.python_version(),
+                    'django': django.get_version(),
+                    'database': connection.vendor,
+                    'connections': get_connection_stats(),
+                    'repeat': self.repeat,
+                    'rows': {
+                        model._meta.model_name: model.objects.count()
+                        for model in (Title, Review, Comment, User)
+                    },
+                },
+                'results': results,
+                'mixed': mixed,
+            },
+            ensure_ascii=False,
+            indent=2,
+            sort_keys=True,
+        )
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf8') as file:
+                file.write(report + '\n')
+        else:
+            self.stdout.write(report)
+        if options['baseline']:
+            self.compare(options['baseline'], results, mixed)
+
+    def compare(self, path, results, mixed):
+        with open(path, encoding='utf8') as file:
+            report = json.load(file)
+        baseline = {
+            result['name']: result for result in report['results']
+        }
+        for result in results:
+            previous = baseline.get(result['name'])
+            if not previous:
+                continue
+            self.stderr.write(
+                f'{result["name"]:<20} p50 '
+                f'{result["p50_ms"] / previous["p50_ms"] - 1:>+8.1%}  '
+                f'запросов {result["queries"] - previous["queries"]:>+3}'
+            )
+        previous = {
+            result['profile']: result for result in report.get('mixed') or ()
+        }
+        for result in mixed or ():
+            if result['profile'] not in previous:
+                continue
+            old = previous[result['profile']]
+            for kind in ('read', 'write'):
+                rps = f'{kind}_rps'
+                if old[rps]:
+                    self.stderr.write(
+                        f'{result["profile"] + "-" + kind:<20} '
+                        f'{result[rps] / old[rps] - 1:>+8.1%}  '
+                        f'ошибок {result["errors"] - old["errors"]:>+5}'
+                    )
@@ -1,7 +1,20 @@
+import math
+from http import HTTPStatus
+
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from rest_framework import filters, mixins, viewsets
 from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.permissions import SAFE_METHODS
 
+from reviews.database import replica_reads
+from .caching import (cache_response, get_cached_response,
+                      get_request_signature, get_response_key)
 from .permission import AdminOrReadOnly
+from .replica import is_stuck_to_primary, stick_to_primary
+from .versions import get_versions
 
 
 class BaseClassViewSet(mixins.CreateModelMixin, mixins.ListModelMixin,
@@ -13,3 +26,115 @@ class BaseClassViewSet(mixins.CreateModelMixin, mixins.ListModelMixin,
     filter_backends = (filters.SearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
+
+
+class ReplicaReadMixin:
+    def dispatch(self, request, *args, **kwargs):
+        token = replica_reads.set(False)
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        finally:
+            replica_reads.reset(token)
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < HTTPStatus.BAD_REQUEST
+        ):
+            stick_to_primary(self.request, response)
+        return response
+
+    def initial(self, request, *args, **kwargs):
+        # Пользователь определяется по основной базе, дальше безопасные
+        # запросы читают из реплики, пока не истекла запись после изменений.
+        replica_reads.set(
+            request.method in SAFE_METHODS
+            and not is_stuck_to_primary(request)
+        )
+        super().initial(request, *args, **kwargs)
+
+
+class ParentObjectMixin:
+    parent_queryset = None
+    parent_lookups = {}
+
+    def get_parent(self):
+        if 'parent' not in self.__dict__:
+            self.parent = get_object_or_404(self.parent_queryset, **{
+                field: self.kwargs.get(kwarg)
+                for kwarg, field in self.parent_lookups.items()
+            })
+        return self.parent
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.get_parent()
+
+
+class VersionScopeMixin:
+    version_models = ()
+
+    def get_version_scopes(self):
+        return [(model, None) for model in self.version_models]
+
+
+class CachedResponseMixin(VersionScopeMixin):
+    def is_response_cacheable(self, request):
+        return (
+            request.method == 'GET'
+            and 'HTTP_AUTHORIZATION' not in request.META
+        )
+
+    def dispatch(self, request, *args, **kwargs):
+        if not self.is_response_cacheable(request):
+            return super().dispatch(request, *args, **kwargs)
+        key = get_response_key(request, self.get_version_scopes())
+        cached = get_cached_response(key)
+        if cached is not None:
+            status, content, headers = cached
+            headers = dict(headers)
+            response = get_conditional_response(
+                request,
+                etag=headers.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    headers.get('Last-Modified', '')
+                ),
+            )
+            if response is None:
+                response = HttpResponse(content, status=status)
+            else:
+                headers.pop('Content-Type', None)
+            for header, value in headers.items():
+                response[header] = value
+            response['X-Cache'] = 'HIT'
+            return response
+        response = super().dispatch(request, *args, **kwargs)
+        if response.status_code == HTTPStatus.OK:
+            response.render()
+            cache_response(key, response)
+        response['X-Cache'] = 'MISS'
+        return response
+
+
+class ConditionalListMixin(VersionScopeMixin):
+    def conditional_get(self, handler, request, *args, **kwargs):
+        versions, changed_at = get_versions(self.get_version_scopes())
+        etag = quote_etag(get_request_signature(request, versions))
+        last_modified = math.ceil(changed_at)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = handler(request, *args, **kwargs)
+        if response.status_code in (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.conditional_get(super().list, request, *args, **kwargs)
+
+
+class ConditionalGetMixin(ConditionalListMixin):
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(
+            super().retrieve, request, *args, **kwargs
+        )
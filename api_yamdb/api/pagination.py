@@ -0,0 +1,123 @@
+import hashlib
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .versions import get_versions
+
+COUNT_KEY = 'count:{}:{}:{}'
+
+
+class LimitOffsetOrCursorPagination(LimitOffsetPagination):
+    """LimitOffset по умолчанию, keyset-пагинация при наличии `?cursor=`.
+
+    Порядок курсора задаётся атрибутом `cursor_ordering` у вьюсета.
+    Общее количество объектов кешируется, `?count=false` его отключает.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_ordering = ('-pub_date', 'id')
+    count_query_param = 'count'
+
+    def get_cursor_paginator(self, view):
+        paginator = CursorPagination()
+        paginator.cursor_query_param = self.cursor_query_param
+        paginator.ordering = getattr(
+            view, 'cursor_ordering', self.cursor_ordering
+        )
+        paginator.page_size_query_param = self.limit_query_param
+        paginator.max_page_size = self.max_limit
+        return paginator
+
+    def get_count_key(self, queryset):
+        params = sorted(
+            (key, value)
+            for key, values in self.request.query_params.lists()
+            if key not in (
+                self.limit_query_param,
+                self.offset_query_param,
+                self.count_query_param,
+            )
+            for value in values
+        )
+        filters = hashlib.md5(repr(params).encode()).hexdigest()
+        get_version_scopes = getattr(self.view, 'get_version_scopes', None)
+        scopes = (
+            get_version_scopes() if get_version_scopes
+            else ((queryset.model, None),)
+        )
+        versions, _ = get_versions(scopes)
+        return COUNT_KEY.format(
+            '.'.join(map(str, versions)), self.request.path, filters
+        )
+
+    def get_count(self, queryset):
+        key = self.get_count_key(queryset)
+        count = cache.get(key)
+        if count is None:
+            count = super().get_count(queryset)
+            cache.set(key, count, settings.COUNT_CACHE_TIMEOUT)
+        return count
+
+    def is_count_requested(self, request):
+        return request.query_params.get(
+            self.count_query_param, ''
+        ).lower() not in ('false', '0')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.view = view
+        self.cursor_paginator = None
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.get_cursor_paginator(view)
+            return self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+        if self.is_count_requested(request):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.limit = self.get_limit(request)
+        if self.limit is None:
+            return None
+        self.offset = self.get_offset(request)
+        self.count = None
+        page = list(queryset[self.offset:self.offset + self.limit + 1])
+        self.has_next = len(page) > self.limit
+        return page[:self.limit]
+
+    def get_next_link(self):
+        if self.count is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_paginated_response(data)
+        if self.count is None:
+            return Response(OrderedDict([
+                ('next', self.get_next_link()),
+                ('previous', self.get_previous_link()),
+                ('results', data),
+            ]))
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator:
+            return self.cursor_paginator.get_html_context()
+        if self.count is None:
+            return {
+                'previous_url': self.get_previous_link(),
+                'next_url': self.get_next_link(),
+                'page_links': [],
+            }
+        return super().get_html_context()
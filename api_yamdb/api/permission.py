@@ -28,7 +28,7 @@ class AuthorOrModerOrReadOnly(BasePermission):
                 request.user.is_authenticated and (
                     request.user.is_admin or (
                         request.user.is_moderator or (
-                            request.user == obj.author
+                            request.user.pk == obj.author_id
                         )
                     )
                 )
@@ -0,0 +1,30 @@
+from django.conf import settings
+
+# Отметка хранится у клиента, поэтому её видит любой процесс.
+STICKY_COOKIE = 'replica_sticky'
+STICKY_SALT = 'api.replica'
+
+
+def stick_to_primary(request, response):
+    if not request.user.is_authenticated:
+        return
+    response.set_signed_cookie(
+        STICKY_COOKIE,
+        request.user.pk,
+        salt=STICKY_SALT,
+        max_age=settings.REPLICA_STICKY_TIMEOUT,
+        httponly=True,
+        samesite='Lax',
+    )
+
+
+def is_stuck_to_primary(request):
+    return bool(
+        request.user.is_authenticated
+        and request.get_signed_cookie(
+            STICKY_COOKIE,
+            default=None,
+            salt=STICKY_SALT,
+            max_age=settings.REPLICA_STICKY_TIMEOUT,
+        ) == str(request.user.pk)
+    )
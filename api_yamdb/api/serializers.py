@@ -1,15 +1,23 @@
 import datetime as dt
+from operator import itemgetter
 
+from django.conf import settings
+from django.db import IntegrityError, transaction
 from django.db.models import Q
-from django.shortcuts import get_object_or_404
 from rest_framework import serializers
 from rest_framework.relations import SlugRelatedField
+from rest_framework.settings import api_settings
 from rest_framework.validators import UniqueValidator
 
-from constants import MAX_EMAIL_LENGTH, MAX_USERNAME_LENGTH
-from reviews.models import Category, Comment, Genre, Review, Title
+from constants import (MAX_BATCH_SIZE, MAX_EMAIL_LENGTH, MAX_SEARCH_LIMIT,
+                       MAX_TITLE_BATCH_SIZE, MAX_USERNAME_LENGTH,
+                       SEARCH_TYPES)
+from reviews.models import Category, Comment, Genre, Genre_title, Review, Title
+from reviews.signals import change_rating
+from reviews.utils import bulk_create_with_ids
 from users.models import User
 from users.validators import UsernameValidationMixin
+from .signals import invalidate_objects
 
 
 class CategorySerializer(serializers.ModelSerializer):
@@ -63,6 +71,126 @@ class TitleSerializer(serializers.ModelSerializer):
         return TitleReadSerializer(instance).data
 
 
+class TitleBatchListSerializer(serializers.ListSerializer):
+    def to_internal_value(self, data):
+        if not isinstance(data, list) or not (
+            0 < len(data) <= MAX_TITLE_BATCH_SIZE
+        ):
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Передайте список от 1 до {MAX_TITLE_BATCH_SIZE} '
+                    'произведений.'
+                ]
+            })
+        self.item_errors = {}
+        items = []
+        for index, item in enumerate(data):
+            try:
+                items.append(
+                    {**self.child.run_validation(item), 'index': index}
+                )
+            except serializers.ValidationError as error:
+                self.item_errors[index] = error.detail
+        return items
+
+    def validate(self, attrs):
+        categories = Category.objects.in_bulk(
+            {item['category'] for item in attrs}, field_name='slug'
+        )
+        genres = Genre.objects.in_bulk(
+            {slug for item in attrs for slug in item['genre']},
+            field_name='slug'
+        )
+        titles = Title.objects.in_bulk(
+            {item['id'] for item in attrs if 'id' in item}
+        )
+        valid = []
+        seen = set()
+        for item in attrs:
+            errors = {}
+            if item['category'] not in categories:
+                errors['category'] = [
+                    f'Категория {item["category"]} не найдена.'
+                ]
+            missing = [slug for slug in item['genre'] if slug not in genres]
+            if missing:
+                errors['genre'] = [
+                    f'Жанры не найдены: {", ".join(missing)}.'
+                ]
+            title_id = item.pop('id', None)
+            if title_id is not None and title_id not in titles:
+                errors['id'] = [f'Произведение с id {title_id} не найдено.']
+            elif title_id is not None and title_id in seen:
+                errors['id'] = [f'Произведение с id {title_id} повторяется.']
+            if errors:
+                self.item_errors[item['index']] = errors
+                continue
+            seen.add(title_id)
+            item['instance'] = titles.get(title_id)
+            item['category'] = categories[item['category']]
+            item['genre'] = [
+                genres[slug] for slug in dict.fromkeys(item['genre'])
+            ]
+            valid.append(item)
+        return valid
+
+    def create(self, validated_data):
+        created = []
+        updated = []
+        links = []
+        saved = []
+        results = [
+            {'index': index, 'status': 'error', 'errors': errors}
+            for index, errors in self.item_errors.items()
+        ]
+        for item in validated_data:
+            title = item.pop('instance')
+            genres = item.pop('genre')
+            result = {'index': item.pop('index')}
+            if title is None:
+                title = Title()
+                created.append(title)
+                result['status'] = 'created'
+            else:
+                updated.append(title)
+                result['status'] = 'updated'
+            for field, value in item.items():
+                setattr(title, field, value)
+            links.extend((title, genre) for genre in genres)
+            results.append(result)
+            saved.append((result, title))
+
+        with transaction.atomic():
+            bulk_create_with_ids(Title, created)
+            Title.objects.bulk_update(
+                updated, ('name', 'year', 'description', 'category')
+            )
+            Genre_title.objects.filter(title__in=updated).delete()
+            Genre_title.objects.bulk_create(
+                Genre_title(title=title, genre=genre)
+                for title, genre in links
+            )
+        invalidate_objects(Title, created + updated)
+        for result, title in saved:
+            result['id'] = title.pk
+        return sorted(results, key=itemgetter('index'))
+
+    def to_representation(self, results):
+        return results
+
+
+class TitleBatchSerializer(TitleSerializer):
+    id = serializers.IntegerField(required=False)
+    category = serializers.SlugField()
+    genre = serializers.ListField(
+        child=serializers.SlugField(),
+        allow_empty=False,
+    )
+
+    class Meta(TitleSerializer.Meta):
+        list_serializer_class = TitleBatchListSerializer
+
+
 class TitleReadSerializer(serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     genre = GenreSerializer(read_only=True, many=True)
@@ -104,18 +232,23 @@ class ReviewSerializer(serializers.ModelSerializer):
             )
         return value
 
-    def validate(self, attrs):
-        if self.context['request'].method == 'POST':
-            user = self.context['request'].user
-            title_id = self.context['view'].kwargs['title_id']
-            title = get_object_or_404(Title, pk=title_id)
-
-            if Review.objects.filter(author=user, title=title).exists():
-                raise serializers.ValidationError(
+    def create(self, validated_data):
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # Повтор проверяется только после ошибки, остальные нарушения
+            # целостности пробрасываются как есть.
+            if not Review.objects.filter(
+                author=validated_data['author'],
+                title=validated_data['title'],
+            ).exists():
+                raise
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
                     'Вы уже оставили отзыв на это произведение'
-                )
-
-        return attrs
+                ]
+            })
 
 
 class CommentSerializer(serializers.ModelSerializer):
@@ -134,6 +267,115 @@ class CommentSerializer(serializers.ModelSerializer):
         )
 
 
+class BatchAuthorField(serializers.SlugRelatedField):
+    def to_internal_value(self, data):
+        return str(data)
+
+
+class BatchListSerializer(serializers.ListSerializer):
+    parent_field = None
+
+    def to_internal_value(self, data):
+        # Размер проверяется до разбора элементов, чтобы огромная пачка
+        # не валидировалась целиком ради одной ошибки.
+        if isinstance(data, list) and not 0 < len(data) <= MAX_BATCH_SIZE:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Передайте от 1 до {MAX_BATCH_SIZE} объектов.'
+                ]
+            })
+        return super().to_internal_value(data)
+
+    def validate(self, attrs):
+        user = self.context['request'].user
+        usernames = {item['author'] for item in attrs if 'author' in item}
+        if usernames and not user.is_admin:
+            raise serializers.ValidationError(
+                'Указывать автора может только администратор.'
+            )
+        authors = User.objects.in_bulk(usernames, field_name='username')
+        errors = [
+            f'Элемент {index}: пользователь {item["author"]} не найден.'
+            for index, item in enumerate(attrs)
+            if 'author' in item and item['author'] not in authors
+        ]
+        if errors:
+            raise serializers.ValidationError(errors)
+        for item in attrs:
+            item['author'] = authors.get(item.get('author'), user)
+        return attrs
+
+    def create(self, validated_data):
+        model = self.child.Meta.model
+        objects = [model(**attrs) for attrs in validated_data]
+        with transaction.atomic():
+            bulk_create_with_ids(model, objects, **{
+                self.parent_field: getattr(objects[0], self.parent_field)
+            })
+            self.after_create(objects)
+        invalidate_objects(model, objects)
+        return objects
+
+    def after_create(self, objects):
+        pass
+
+
+class ReviewBatchListSerializer(BatchListSerializer):
+    parent_field = 'title'
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        title_id = self.context['view'].kwargs['title_id']
+        existing = set(Review.objects.filter(
+            title_id=title_id,
+            author__in=[item['author'].pk for item in attrs],
+        ).values_list('author_id', flat=True))
+        errors = []
+        for index, item in enumerate(attrs):
+            if item['author'].pk in existing:
+                errors.append(
+                    f'Элемент {index}: у пользователя '
+                    f'{item["author"].username} уже есть отзыв на это '
+                    'произведение.'
+                )
+            existing.add(item['author'].pk)
+        if errors:
+            raise serializers.ValidationError(errors)
+        return attrs
+
+    def after_create(self, objects):
+        change_rating(
+            objects[0].title_id, sum(obj.score for obj in objects),
+            len(objects)
+        )
+
+
+class ReviewBatchSerializer(ReviewSerializer):
+    author = BatchAuthorField(
+        slug_field='username',
+        queryset=User.objects.all(),
+        required=False,
+    )
+
+    class Meta(ReviewSerializer.Meta):
+        list_serializer_class = ReviewBatchListSerializer
+
+
+class CommentBatchListSerializer(BatchListSerializer):
+    parent_field = 'review'
+
+
+class CommentBatchSerializer(CommentSerializer):
+    author = BatchAuthorField(
+        slug_field='username',
+        queryset=User.objects.all(),
+        required=False,
+    )
+
+    class Meta(CommentSerializer.Meta):
+        list_serializer_class = CommentBatchListSerializer
+
+
 class UserSerializer(UsernameValidationMixin, serializers.ModelSerializer):
     username = serializers.CharField(
         required=True,
@@ -208,3 +450,25 @@ class UserCreateSerializer(
 class GetTokenSerializer(serializers.Serializer):
     username = serializers.CharField(required=True)
     confirmation_code = serializers.CharField(required=True)
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(required=True)
+    type = serializers.MultipleChoiceField(
+        choices=SEARCH_TYPES,
+        required=False,
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=MAX_SEARCH_LIMIT,
+        default=settings.REST_FRAMEWORK['PAGE_SIZE'],
+    )
+    offset = serializers.IntegerField(min_value=0, default=0)
+
+
+class SearchResultSerializer(serializers.Serializer):
+    type = serializers.CharField()
+    id = serializers.IntegerField()
+    title_id = serializers.IntegerField()
+    review_id = serializers.IntegerField(allow_null=True)
+    text = serializers.CharField()
@@ -0,0 +1,108 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
+
+from reviews.models import Category, Comment, Genre, Genre_title, Review, Title
+from reviews.signals import bulk_changed
+from users.models import User
+from .authentication import invalidate_user, revoke_role_claims
+from .tokens import ROLE_CLAIMS
+from .versions import USERNAME_SCOPE, bump_epoch, bump_versions
+
+VERSION_SCOPES = {
+    Title: lambda title: ((Title, None), (Title, title.pk)),
+    Genre_title: lambda link: ((Title, None), (Title, link.title_id)),
+    Category: lambda category: ((Category, None),),
+    Genre: lambda genre: ((Genre, None),),
+    Review: lambda review: (
+        (Review, review.title_id), (Title, None), (Title, review.title_id)
+    ),
+    Comment: lambda comment: ((Comment, comment.review_id),),
+    User: lambda user: (
+        (User, None), *((USERNAME_SCOPE,) if username_changed(user) else ())
+    ),
+}
+
+
+def username_changed(user):
+    previous = getattr(user, '_previous_username', None)
+    return previous is not None and previous != user.username
+
+
+def invalidate_objects(model, objects):
+    scopes = {
+        scope for obj in objects for scope in VERSION_SCOPES[model](obj)
+    }
+    # Повторное увеличение после коммита сбрасывает ответы, закешированные
+    # по новой версии, но из ещё не закоммиченных данных.
+    bump_versions(scopes)
+    transaction.on_commit(partial(bump_versions, scopes))
+
+
+def invalidate_versions(sender, instance, **kwargs):
+    invalidate_objects(sender, (instance,))
+
+
+def invalidate_genre_links(sender, instance, action, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if isinstance(instance, Title):
+        invalidate_objects(Title, (instance,))
+    else:
+        invalidate_objects(Genre, (instance,))
+
+
+for sender in VERSION_SCOPES:
+    post_save.connect(invalidate_versions, sender=sender)
+    post_delete.connect(invalidate_versions, sender=sender)
+m2m_changed.connect(invalidate_genre_links, sender=Genre_title)
+
+
+def invalidate_bulk_changes(sender, **kwargs):
+    # Массовая запись не сообщает, какие объекты изменились, поэтому
+    # сбрасываются версии всех областей.
+    bump_epoch()
+    transaction.on_commit(bump_epoch)
+
+
+bulk_changed.connect(invalidate_bulk_changes)
+
+
+def remember_previous_user(sender, instance, **kwargs):
+    instance._previous_username = None
+    instance._previous_role_claims = None
+    previous = None
+    if instance.pk:
+        previous = User.objects.filter(pk=instance.pk).values_list(
+            'username', *ROLE_CLAIMS
+        ).first()
+    if previous is not None:
+        instance._previous_username, *claims = previous
+        instance._previous_role_claims = tuple(claims)
+
+
+def invalidate_cached_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    previous = getattr(instance, '_previous_role_claims', None)
+    current = tuple(getattr(instance, claim) for claim in ROLE_CLAIMS)
+    if previous is not None and previous != current:
+        # Версия хранится в базе: токены с прежними правами отклоняются
+        # в любом процессе, даже если кеш пуст.
+        User.objects.filter(pk=instance.pk).update(
+            claims_version=F('claims_version') + 1
+        )
+        instance.refresh_from_db(fields=['claims_version'])
+        revoke_role_claims(instance.pk)
+
+
+def revoke_deleted_user(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+    revoke_role_claims(instance.pk)
+
+
+pre_save.connect(remember_previous_user, sender=User)
+post_save.connect(invalidate_cached_user, sender=User)
+post_delete.connect(revoke_deleted_user, sender=User)
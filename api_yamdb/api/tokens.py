@@ -0,0 +1,25 @@
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import AccessToken
+
+ROLE_CLAIMS = ('role', 'is_staff', 'is_superuser', 'is_active')
+CLAIMS_VERSION_CLAIM = 'claims_version'
+CLAIMS_VERSION_KEY = 'claims-version:{}'
+
+
+def cache_claims_version(user_id, version):
+    cache.set(
+        CLAIMS_VERSION_KEY.format(user_id), version,
+        settings.USER_CACHE_TIMEOUT,
+    )
+
+
+class RoleAccessToken(AccessToken):
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        for claim in ROLE_CLAIMS:
+            token[claim] = getattr(user, claim)
+        token[CLAIMS_VERSION_CLAIM] = user.claims_version
+        cache_claims_version(user.pk, user.claims_version)
+        return token
@@ -36,6 +36,17 @@ auth_urls = [
 
 v1_urls = [
     path('auth/', include(auth_urls)),
+    path('search/', views.search, name='search'),
+    path(
+        'export/<slug:name>.<slug:file_format>',
+        views.export,
+        name='export'
+    ),
+    path(
+        'metrics/connections/',
+        views.connection_stats,
+        name='connection_stats'
+    ),
     path('', include(router_v1.urls)),
 ]
 
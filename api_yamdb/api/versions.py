@@ -0,0 +1,73 @@
+import time
+
+from django.core.cache import caches
+
+from users.models import User
+
+# Версии хранятся рядом с кешем ответов: при общем хранилище (файлы,
+# Redis) их видят все процессы.
+VERSION_CACHE_ALIAS = 'responses'
+VERSION_KEY = 'version:{}'
+CHANGED_KEY = 'changed:{}'
+
+# Отзывы и комментарии показывают только username автора, поэтому зависят
+# от этой области, а не от всех изменений пользователей.
+USERNAME_SCOPE = (User, 'username')
+# Общая версия входит в каждый набор версий. Её увеличивают массовые
+# записи в обход сигналов моделей, когда затронутые области неизвестны.
+EPOCH_LABEL = 'epoch'
+
+
+def get_version_cache():
+    return caches[VERSION_CACHE_ALIAS]
+
+
+def get_scope_label(model, parent_id=None):
+    label = model._meta.label_lower
+    if parent_id is None:
+        return label
+    return f'{label}:{parent_id}'
+
+
+def get_versions(scopes):
+    version_cache = get_version_cache()
+    labels = [get_scope_label(*scope) for scope in scopes] + [EPOCH_LABEL]
+    version_keys = [VERSION_KEY.format(label) for label in labels]
+    changed_keys = [CHANGED_KEY.format(label) for label in labels]
+    state = version_cache.get_many(version_keys + changed_keys)
+    now = time.time()
+    # Потерянный счётчик начинается с текущего времени в миллисекундах,
+    # чтобы не повторить значение, которое уже попало в кеш или ETag.
+    # Неизвестное время изменения считается текущим.
+    for key in version_keys + changed_keys:
+        if key not in state:
+            value = int(now * 1000) if key in version_keys else now
+            if not version_cache.add(key, value, None):
+                value = version_cache.get(key, value)
+            state[key] = value
+    return (
+        [state[key] for key in version_keys],
+        max((state[key] for key in changed_keys), default=now),
+    )
+
+
+def bump_labels(labels):
+    version_cache = get_version_cache()
+    now = time.time()
+    for label in labels:
+        key = VERSION_KEY.format(label)
+        try:
+            version_cache.incr(key)
+        except ValueError:
+            version_cache.set(key, int(now * 1000), None)
+    version_cache.set_many(
+        {CHANGED_KEY.format(label): now for label in labels}, None
+    )
+
+
+def bump_versions(scopes):
+    bump_labels({get_scope_label(*scope) for scope in scopes})
+
+
+def bump_epoch():
+    bump_labels({EPOCH_LABEL})
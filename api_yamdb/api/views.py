@@ -2,35 +2,45 @@ import random
 from string import digits
 
 from django.core.mail import send_mail
-from django.db.models import Avg
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import filters, status, viewsets
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import NotFound
 from rest_framework.filters import OrderingFilter
-from rest_framework.pagination import LimitOffsetPagination
 from rest_framework.permissions import (AllowAny, IsAuthenticated,
                                         IsAuthenticatedOrReadOnly)
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import AccessToken
+from rest_framework.utils.urls import replace_query_param
 
 from api import serializers
-from reviews.models import Category, Genre, Review, Title
+from constants import SEARCH_TYPES
+from reviews.database import get_connection_stats
+from reviews.exporters import EXPORT_FORMATS, EXPORTS, export_lines
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.search import search_text
 from users.models import User
 from .filters import TitleFilter
-from .mixins import BaseClassViewSet
+from .mixins import (BaseClassViewSet, CachedResponseMixin,
+                     ConditionalGetMixin, ConditionalListMixin,
+                     ParentObjectMixin, ReplicaReadMixin)
+from .pagination import LimitOffsetOrCursorPagination
 from .permission import AdminOrReadOnly, AuthorOrModerOrReadOnly, IsAdminUser
-from .serializers import (GetTokenSerializer, UserCreateSerializer,
+from .serializers import (GetTokenSerializer, SearchQuerySerializer,
+                          SearchResultSerializer, UserCreateSerializer,
                           UserSerializer)
+from .tokens import RoleAccessToken
+from .versions import USERNAME_SCOPE
 
 
-class TitleViewSet(viewsets.ModelViewSet):
-    queryset = Title.objects.annotate(
-        rating=Avg(
-            'reviews__score',
-        )
-    ).order_by('name')
-    pagination_class = LimitOffsetPagination
+class TitleViewSet(ReplicaReadMixin, CachedResponseMixin, ConditionalGetMixin,
+                   viewsets.ModelViewSet):
+    queryset = Title.objects.select_related(
+        'category'
+    ).prefetch_related('genre').order_by('name')
+    pagination_class = LimitOffsetOrCursorPagination
     serializer_class = serializers.TitleSerializer
     permission_classes = (
         AdminOrReadOnly,
@@ -38,70 +48,123 @@ class TitleViewSet(viewsets.ModelViewSet):
     filterset_class = TitleFilter
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     ordering_fields = ['name', 'id']
-    ordering = ['name']
+    ordering = ['name', 'id']
+
+    def get_version_scopes(self):
+        return (
+            (Title, self.kwargs.get('pk')), (Category, None), (Genre, None)
+        )
 
     def get_serializer_class(self):
         if self.action in ('list', 'retrieve'):
             return serializers.TitleReadSerializer
+        if self.action == 'batch':
+            return serializers.TitleBatchSerializer
         return serializers.TitleSerializer
 
+    @action(detail=False, methods=['post'])
+    def batch(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
+
 
-class CategoryViewSet(BaseClassViewSet):
+class CategoryViewSet(ReplicaReadMixin, CachedResponseMixin,
+                      ConditionalListMixin, BaseClassViewSet):
     queryset = Category.objects.all()
     serializer_class = serializers.CategorySerializer
+    version_models = (Category,)
 
 
-class GenreViewSet(BaseClassViewSet):
+class GenreViewSet(ReplicaReadMixin, CachedResponseMixin, ConditionalListMixin,
+                   BaseClassViewSet):
     queryset = Genre.objects.all()
     serializer_class = serializers.GenreSerializer
+    version_models = (Genre,)
 
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(ReplicaReadMixin, ParentObjectMixin, ConditionalGetMixin,
+                    viewsets.ModelViewSet):
     serializer_class = serializers.ReviewSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
     permission_classes = (
         AuthorOrModerOrReadOnly,
         IsAuthenticatedOrReadOnly,
     )
+    parent_queryset = Title.objects.all()
+    parent_lookups = {'title_id': 'pk'}
 
-    def get_title(self):
-        return get_object_or_404(Title, pk=self.kwargs.get('title_id'))
+    def get_version_scopes(self):
+        return ((Review, self.kwargs.get('title_id')), USERNAME_SCOPE)
 
     def get_queryset(self):
-        return self.get_title().reviews.all()
+        return self.get_parent().reviews.select_related('author')
+
+    def get_serializer_class(self):
+        if self.action == 'batch':
+            return serializers.ReviewBatchSerializer
+        return super().get_serializer_class()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        serializer.save(author=self.request.user, title=self.get_parent())
 
+    @action(detail=False, methods=['post'])
+    def batch(self, request, title_id):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(title=self.get_parent())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class CommentViewSet(viewsets.ModelViewSet):
+
+class CommentViewSet(ReplicaReadMixin, ParentObjectMixin, ConditionalGetMixin,
+                     viewsets.ModelViewSet):
     serializer_class = serializers.CommentSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
     permission_classes = (
         AuthorOrModerOrReadOnly,
         IsAuthenticatedOrReadOnly,
     )
+    parent_queryset = Review.objects.all()
+    parent_lookups = {'review_id': 'pk', 'title_id': 'title_id'}
 
-    def get_review(self):
-        return get_object_or_404(Review, pk=self.kwargs.get('review_id'))
+    def get_version_scopes(self):
+        return ((Comment, self.kwargs.get('review_id')), USERNAME_SCOPE)
 
     def get_queryset(self):
-        return self.get_review().comments.all()
+        return Comment.objects.filter(
+            review_id=self.kwargs.get('review_id'),
+            review__title_id=self.kwargs.get('title_id'),
+        ).select_related('author')
+
+    def get_serializer_class(self):
+        if self.action == 'batch':
+            return serializers.CommentBatchSerializer
+        return super().get_serializer_class()
 
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, review=self.get_review())
+        serializer.save(author=self.request.user, review=self.get_parent())
+
+    @action(detail=False, methods=['post'])
+    def batch(self, request, title_id, review_id):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(review=self.get_parent())
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
-    pagination_class = LimitOffsetPagination
+    pagination_class = LimitOffsetOrCursorPagination
     permission_classes = (
         IsAdminUser,
     )
+    version_models = (User,)
     filter_backends = (filters.SearchFilter,)
     search_fields = ('username',)
     lookup_field = 'username'
+    cursor_ordering = ('username',)
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     @action(
@@ -111,13 +174,16 @@ class UserViewSet(viewsets.ModelViewSet):
     )
     def me(self, request):
         if request.method == 'PATCH':
+            # request.user может быть устаревшей копией из кеша или
+            # данными токена: сохранять можно только свежую строку.
+            user = get_object_or_404(User, pk=request.user.pk)
             serializer = self.get_serializer(
-                request.user,
+                user,
                 data=request.data,
                 partial=True
             )
             serializer.is_valid(raise_exception=True)
-            serializer.save(role=request.user.role)
+            serializer.save(role=user.role)
         if request.method == 'GET':
             serializer = self.get_serializer(request.user)
         return Response(serializer.data)
@@ -132,15 +198,15 @@ def create_user(request):
     username = serializer.validated_data['username']
     email = serializer.validated_data['email']
     confirmation_code = ''.join(random.choices(digits, k=5))
-    serializer.save(confirmation_code=confirmation_code)
-
-    send_mail(
-        'Код подтверждения для API_YAMDB',
-        'Код подтверждения: ' + confirmation_code,
-        'from@example.com',
-        [email],
-        fail_silently=False,
-    )
+    with transaction.atomic():
+        serializer.save(confirmation_code=confirmation_code)
+        send_mail(
+            'Код подтверждения для API_YAMDB',
+            'Код подтверждения: ' + confirmation_code,
+            'from@example.com',
+            [email],
+            fail_silently=False,
+        )
 
     return Response(
         {
@@ -169,6 +235,58 @@ def get_token(request):
         )
     user.confirmation_code = 0
     user.save()
-    token = AccessToken.for_user(user)
+    token = RoleAccessToken.for_user(user)
 
     return Response({'token': str(token)}, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search(request):
+    serializer = SearchQuerySerializer(data=request.query_params)
+    serializer.is_valid(raise_exception=True)
+    limit = serializer.validated_data['limit']
+    offset = serializer.validated_data['offset']
+    types = serializer.validated_data.get('type') or SEARCH_TYPES
+    results = search_text(
+        serializer.validated_data['q'],
+        [search_type for search_type in SEARCH_TYPES if search_type in types],
+        limit + 1,
+        offset,
+    )
+    next_url = None
+    if len(results) > limit:
+        next_url = replace_query_param(
+            request.build_absolute_uri(), 'offset', offset + limit
+        )
+
+    return Response(
+        {
+            'next': next_url,
+            'results': SearchResultSerializer(
+                results[:limit], many=True
+            ).data,
+        },
+        status=status.HTTP_200_OK
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def export(request, name, file_format):
+    if name not in EXPORTS or file_format not in EXPORT_FORMATS:
+        raise NotFound('Неизвестная таблица или формат выгрузки.')
+    response = StreamingHttpResponse(
+        export_lines(name, file_format),
+        content_type=EXPORT_FORMATS[file_format]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{name}.{file_format}"'
+    )
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def connection_stats(request):
+    return Response(get_connection_stats())
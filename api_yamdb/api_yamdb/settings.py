@@ -1,6 +1,9 @@
 import os
+from importlib.util import find_spec
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # SECURITY WARNING: keep the secret key used in production secret!
@@ -62,13 +65,56 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
+# Соединения живут CONN_MAX_AGE секунд (0 — закрываются после каждого
+# запроса) и перед повторным использованием проверяются.
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', 60))
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'NAME': os.getenv('DB_NAME', BASE_DIR / 'db.sqlite3'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# Реплика для чтения: копия базы или тот же файл только на чтение
+# (`file:db.sqlite3?mode=ro`).
+if os.getenv('DB_REPLICA_NAME'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_REPLICA_NAME'),
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['reviews.database.ReplicaRouter']
+
+# Сколько секунд после записи пользователь читает из основной базы.
+REPLICA_STICKY_TIMEOUT = 10
+
+# Применяются к каждому новому соединению с SQLite.
+SQLITE_PRAGMA_PROFILES = {
+    # Значения SQLite по умолчанию. Режим журнала сохраняется в файле базы,
+    # поэтому после WAL он возвращается явно.
+    'stock': {
+        'journal_mode': 'DELETE',
+    },
+    'production': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+SQLITE_PRAGMAS = SQLITE_PRAGMA_PROFILES[
+    os.getenv('SQLITE_PROFILE', 'production')
+]
+
 
 # Password validation
 
@@ -91,7 +137,7 @@ AUTH_PASSWORD_VALIDATORS = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.AllowAny',
@@ -131,6 +177,66 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
-EMAIL_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+EMAIL_BACKEND = 'users.backends.OutboxEmailBackend'
+
+EMAIL_OUTBOX_BACKEND = 'django.core.mail.backends.filebased.EmailBackend'
+
+EMAIL_OUTBOX_BATCH_SIZE = 100
+
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+
+EMAIL_OUTBOX_RETRY_DELAY = 60
+
+# Через сколько секунд письмо, взятое упавшим обработчиком, снова в очереди.
+EMAIL_OUTBOX_CLAIM_TIMEOUT = 300
 
 EMAIL_FILE_PATH = os.path.join(BASE_DIR, 'sent_emails')
+
+
+# Cache
+
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv(
+            'RESPONSE_CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')
+        ),
+    },
+    # Требует пакет django-redis.
+    'redis': {
+        'BACKEND': 'django_redis.cache.RedisCache',
+        'LOCATION': os.getenv(
+            'RESPONSE_CACHE_LOCATION', 'redis://127.0.0.1:6379/1'
+        ),
+    },
+}
+
+RESPONSE_CACHE_BACKEND = os.getenv('RESPONSE_CACHE_BACKEND', 'locmem')
+
+if RESPONSE_CACHE_BACKEND not in RESPONSE_CACHE_BACKENDS:
+    raise ImproperlyConfigured(
+        f'Неизвестный RESPONSE_CACHE_BACKEND={RESPONSE_CACHE_BACKEND}, '
+        f'допустимые значения: {", ".join(RESPONSE_CACHE_BACKENDS)}.'
+    )
+if RESPONSE_CACHE_BACKEND == 'redis' and find_spec('django_redis') is None:
+    raise ImproperlyConfigured(
+        'Для RESPONSE_CACHE_BACKEND=redis установите пакет django-redis: '
+        'pip install django-redis'
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': RESPONSE_CACHE_BACKENDS[RESPONSE_CACHE_BACKEND],
+}
+
+RESPONSE_CACHE_TIMEOUT = 300
+
+COUNT_CACHE_TIMEOUT = 60
+
+USER_CACHE_TIMEOUT = 30
@@ -1,5 +1,6 @@
 MAX_USERNAME_LENGTH = 150
 MAX_EMAIL_LENGTH = 254
+EMAIL_SUBJECT_LENGTH = 256
 CONFIRMATION_CODE_LENGTH = 5
 
 USER_ROLE = "user"
@@ -10,3 +11,9 @@ USERNAME_PATTERN = r'^[\w.@+-]+\Z'
 
 CATEGORY_GENRE_NAME_LEN = 256
 CATEGORY_GENRE_SLUG_LEN = 50
+
+SEARCH_TYPES = ('title', 'review', 'comment')
+MAX_SEARCH_LIMIT = 50
+
+MAX_BATCH_SIZE = 100
+MAX_TITLE_BATCH_SIZE = 1000
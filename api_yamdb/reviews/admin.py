@@ -39,7 +39,9 @@ class TitleAdmin(admin.ModelAdmin):
         'year',
         'get_genres',
         'category',
+        'rating_count',
     )
+    readonly_fields = ('rating_sum', 'rating_count')
     search_fields = ('name', 'year',)
     list_filter = ('name',)
     empty_value_display = '-пусто-'
@@ -0,0 +1,98 @@
+import os
+import threading
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+CONNECTION_EVENTS = ('opened', 'reused', 'health_check_failures')
+
+# Счётчики соединений текущего процесса по псевдонимам баз.
+connection_stats = defaultdict(Counter)
+connection_stats_lock = threading.Lock()
+
+
+def count_connection_event(alias, event):
+    with connection_stats_lock:
+        connection_stats[alias][event] += 1
+
+
+def get_connection_stats():
+    with connection_stats_lock:
+        return {
+            'pid': os.getpid(),
+            'databases': {
+                alias: {
+                    'conn_max_age': connections.settings[alias][
+                        'CONN_MAX_AGE'
+                    ],
+                    **{
+                        event: connection_stats[alias][event]
+                        for event in CONNECTION_EVENTS
+                    },
+                }
+                for alias in connections
+            },
+        }
+
+
+@receiver(connection_created)
+def count_new_connection(sender, connection, **kwargs):
+    count_connection_event(connection.alias, 'opened')
+
+
+@receiver(connection_created)
+def apply_sqlite_pragmas(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        # busy_timeout идёт первым, чтобы переключение журнала дождалось
+        # чужих блокировок, а не падало с `database is locked`.
+        for name, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+
+
+@receiver(request_started)
+def check_persistent_connections(sender, **kwargs):
+    # Выполняется после close_old_connections: остались только соединения,
+    # которые Django собирается переиспользовать.
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if (
+            connection.settings_dict.get('CONN_HEALTH_CHECKS')
+            and not connection.is_usable()
+        ):
+            count_connection_event(connection.alias, 'health_check_failures')
+            connection.close()
+            continue
+        count_connection_event(connection.alias, 'reused')
+
+
+REPLICA_ALIAS = 'replica'
+
+# Включается представлениями только на время безопасных запросов.
+replica_reads = ContextVar('replica_reads', default=False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and REPLICA_ALIAS in settings.DATABASES:
+            return REPLICA_ALIAS
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Объект, прочитанный из реплики, сохраняется в основную базу.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return {obj1._state.db, obj2._state.db} <= {
+            DEFAULT_DB_ALIAS, REPLICA_ALIAS
+        }
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db != REPLICA_ALIAS
@@ -0,0 +1,59 @@
+import csv
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from reviews.models import Category, Comment, Genre, Genre_title, Review, Title
+from users.models import User
+
+EXPORTS = {
+    'category': (Category, ('id', 'name', 'slug')),
+    'genre': (Genre, ('id', 'name', 'slug')),
+    'users': (
+        User,
+        ('id', 'username', 'email', 'role', 'bio', 'first_name', 'last_name')
+    ),
+    'titles': (Title, ('id', 'name', 'year', 'description', 'category')),
+    'genre_title': (Genre_title, ('id', 'title_id', 'genre_id')),
+    'review': (
+        Review, ('id', 'title_id', 'text', 'author', 'score', 'pub_date')
+    ),
+    'comments': (
+        Comment, ('id', 'review_id', 'text', 'author', 'pub_date')
+    ),
+}
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+EXPORT_CHUNK_SIZE = 2000
+
+
+class Echo:
+    def write(self, value):
+        return value
+
+
+def csv_lines(columns, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(columns)
+    for row in rows:
+        yield writer.writerow(
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in row
+        )
+
+
+def ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def export_lines(name, file_format, chunk_size=EXPORT_CHUNK_SIZE):
+    model, columns = EXPORTS[name]
+    rows = model.objects.order_by('pk').values_list(*columns).iterator(
+        chunk_size=chunk_size
+    )
+    if file_format == 'csv':
+        return csv_lines(columns, rows)
+    return ndjson_lines(columns, rows)
@@ -0,0 +1,304 @@
+from datetime import datetime
+from itertools import chain
+
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.utils import timezone
+
+from .utils import batched
+
+# Значения этих типов идут в executemany как есть, без to_python и
+# get_db_prep_save на каждое значение.
+INTEGER_TYPES = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField',
+    'BigIntegerField', 'SmallIntegerField', 'PositiveIntegerField',
+    'PositiveSmallIntegerField', 'PositiveBigIntegerField',
+}
+TEXT_TYPES = {'CharField', 'TextField', 'SlugField', 'EmailField'}
+
+
+class SqlBatchImporter:
+    """Вставляет строки CSV многострочными INSERT, минуя создание моделей.
+
+    clean_rows приводит значения, проверяет обязательные поля и прогоняет
+    валидаторы по разу на каждое различное значение в пачке. insert сверяет
+    внешние ключи одним запросом на пачку и вставляет остальное, пропуская
+    конфликты уникальных полей. Уже загруженные id молча пропускаются,
+    остальные строки с ошибками возвращаются вызывающему.
+    """
+
+    def __init__(self, model, columns, using=DEFAULT_DB_ALIAS):
+        opts = model._meta
+        self.connection = connections[using]
+        self.fields = [opts.get_field(column) for column in columns]
+        self.defaults = [
+            field for field in opts.concrete_fields
+            if field not in self.fields and not field.primary_key
+        ]
+        self.foreign_keys = [
+            (position, field.remote_field.model)
+            for position, field in enumerate(self.fields)
+            if field.is_relation
+        ]
+        self.model = model
+        self.pk_position = next(
+            (
+                position for position, field in enumerate(self.fields)
+                if field.primary_key
+            ),
+            None,
+        )
+        self.unique_sets = [
+            (position,) for position, field in enumerate(self.fields)
+            if field.unique and not field.primary_key
+        ] + [
+            tuple(self.fields.index(opts.get_field(name)) for name in names)
+            for names in (
+                *opts.unique_together,
+                *(
+                    constraint.fields
+                    for constraint in opts.total_unique_constraints
+                ),
+            )
+            if all(opts.get_field(name) in self.fields for name in names)
+        ]
+        self.parsers = [self.get_parser(field) for field in self.fields]
+        self.preparers = [
+            self.get_preparer(field) for field in self.fields + self.defaults
+        ]
+        # Как и bulk_create, вставляем пачку многострочными INSERT:
+        # в SQLite это заметно быстрее executemany по одной строке.
+        self.rows_per_query = max(self.connection.ops.bulk_batch_size(
+            self.fields + self.defaults, []
+        ), 1)
+        quote = self.connection.ops.quote_name
+        self.columns = ', '.join(
+            quote(field.column) for field in self.fields + self.defaults
+        )
+        self.placeholders = ['%s'] * len(self.fields + self.defaults)
+        self.table = quote(opts.db_table)
+
+    def get_sql(self, rows, ignore_conflicts):
+        ops = self.connection.ops
+        return ' '.join((
+            ops.insert_statement(ignore_conflicts=ignore_conflicts),
+            f'{self.table} ({self.columns})',
+            ops.bulk_insert_sql(
+                self.fields + self.defaults, [self.placeholders] * rows
+            ),
+            ops.ignore_conflicts_suffix_sql(ignore_conflicts=ignore_conflicts),
+        ))
+
+    @staticmethod
+    def get_internal_type(field):
+        if field.is_relation:
+            field = field.target_field
+        return field.get_internal_type()
+
+    def get_parser(self, field):
+        internal_type = self.get_internal_type(field)
+        if internal_type in TEXT_TYPES:
+            return None
+        if internal_type == 'DateTimeField':
+            def parse_datetime(value):
+                try:
+                    return datetime.fromisoformat(value) if value else None
+                except ValueError:
+                    return field.to_python(value)
+            return parse_datetime
+        if internal_type in INTEGER_TYPES:
+            def parse_integer(value):
+                try:
+                    return int(value) if value != '' else None
+                except ValueError:
+                    return field.to_python(value)
+            return parse_integer
+        return field.to_python
+
+    def get_preparer(self, field):
+        if self.get_internal_type(field) in INTEGER_TYPES | TEXT_TYPES:
+            return None
+        connection = self.connection
+        return lambda value: field.get_db_prep_save(value, connection)
+
+    def clean(self, row):
+        values = []
+        for field, parse, value in zip(self.fields, self.parsers, row):
+            if parse is not None:
+                value = parse(value)
+            if value == '' and field.null:
+                value = None
+            if value is None and not field.null:
+                raise ValidationError(f'{field.name}: обязательное поле')
+            values.append(value)
+        return values
+
+    def validate(self, cleaned):
+        errors = {}
+        for position, field in enumerate(self.fields):
+            if not field.validators:
+                continue
+            values = {
+                values[position] for _, values in cleaned
+                if values[position] is not None
+            }
+            invalid = {}
+            for value in values:
+                try:
+                    field.run_validators(value)
+                except ValidationError as error:
+                    invalid[value] = '; '.join(error.messages)
+            if not invalid:
+                continue
+            for number, values in cleaned:
+                if values[position] in invalid:
+                    errors.setdefault(number, invalid[values[position]])
+        return (
+            [(number, values) for number, values in cleaned
+             if number not in errors],
+            list(errors.items()),
+        )
+
+    def get_default(self, field, now):
+        if getattr(field, 'auto_now', False) or getattr(
+            field, 'auto_now_add', False
+        ):
+            return now
+        return field.get_default()
+
+    def clean_rows(self, rows):
+        cleaned = []
+        errors = []
+        for number, row in rows:
+            try:
+                cleaned.append((number, self.clean(row)))
+            except ValidationError as error:
+                errors.append((number, '; '.join(error.messages)))
+        cleaned, invalid = self.validate(cleaned)
+        return cleaned, errors + invalid
+
+    def check_foreign_keys(self, cleaned):
+        errors = []
+        for position, model in self.foreign_keys:
+            referenced = {
+                values[position] for _, values in cleaned
+                if values[position] is not None
+            }
+            existing = set(model.objects.filter(
+                pk__in=referenced
+            ).values_list('pk', flat=True))
+            valid = []
+            for number, values in cleaned:
+                if values[position] is None or values[position] in existing:
+                    valid.append((number, values))
+                else:
+                    errors.append((
+                        number,
+                        f'{self.fields[position].name}: нет объекта '
+                        f'{model._meta.object_name} с id {values[position]}'
+                    ))
+            cleaned = valid
+        return cleaned, errors
+
+    def skip_loaded(self, cleaned):
+        if self.pk_position is None:
+            return cleaned
+        loaded = set(self.model.objects.filter(pk__in={
+            values[self.pk_position] for _, values in cleaned
+        }).values_list('pk', flat=True))
+        return [
+            (number, values) for number, values in cleaned
+            if values[self.pk_position] not in loaded
+        ]
+
+    def drop_duplicates(self, cleaned, positions, seen):
+        names = [self.fields[position].attname for position in positions]
+        errors = []
+        valid = []
+        for number, values in cleaned:
+            key = tuple(values[position] for position in positions)
+            if None not in key and key in seen:
+                errors.append((
+                    number, f'{", ".join(names)}: значение {key} уже есть'
+                ))
+                continue
+            seen.add(key)
+            valid.append((number, values))
+        return valid, errors
+
+    def check_unique(self, cleaned):
+        errors = []
+        unique_sets = self.unique_sets
+        if self.pk_position is not None:
+            unique_sets = [(self.pk_position,), *unique_sets]
+        for positions in unique_sets:
+            names = [self.fields[position].attname for position in positions]
+            seen = set(self.model.objects.filter(**{
+                f'{names[0]}__in': {
+                    values[positions[0]] for _, values in cleaned
+                }
+            }).values_list(*names))
+            cleaned, unique_errors = self.drop_duplicates(
+                cleaned, positions, seen
+            )
+            errors += unique_errors
+        return cleaned, errors
+
+    def execute(self, cleaned, ignore_conflicts=False):
+        now = timezone.now()
+        defaults = [self.get_default(field, now) for field in self.defaults]
+        params = [values + defaults for _, values in cleaned]
+        for position, prepare in enumerate(self.preparers):
+            if prepare is None:
+                continue
+            if position >= len(self.fields):
+                # Значения по умолчанию одинаковы для всей пачки.
+                value = prepare(params[0][position]) if params else None
+                for row in params:
+                    row[position] = value
+                continue
+            for row in params:
+                if row[position] is not None:
+                    row[position] = prepare(row[position])
+        inserted = 0
+        sql = self.get_sql(self.rows_per_query, ignore_conflicts)
+        with self.connection.cursor() as cursor:
+            for rows in batched(params, self.rows_per_query):
+                if len(rows) < self.rows_per_query:
+                    sql = self.get_sql(len(rows), ignore_conflicts)
+                cursor.execute(sql, list(chain.from_iterable(rows)))
+                inserted += cursor.rowcount
+        return inserted
+
+    def insert(self, cleaned):
+        cleaned, errors = self.check_foreign_keys(self.skip_loaded(cleaned))
+        if (
+            self.pk_position is None
+            or not self.connection.features.supports_ignore_conflicts
+        ):
+            cleaned, unique_errors = self.check_unique(cleaned)
+            self.execute(cleaned)
+            return errors + unique_errors
+        # Проверка составного ключа заранее читает все строки с теми же
+        # значениями первого поля, то есть почти всю таблицу на каждую
+        # пачку. Поэтому конфликты отбрасывает сама база, а причину ищем
+        # только для строк, которые не вставились.
+        cleaned, duplicates = self.drop_duplicates(
+            cleaned, (self.pk_position,), set()
+        )
+        errors += duplicates
+        if self.execute(cleaned, ignore_conflicts=True) == len(cleaned):
+            return errors
+        inserted = set(self.model.objects.filter(pk__in={
+            values[self.pk_position] for _, values in cleaned
+        }).values_list('pk', flat=True))
+        rejected = [
+            (number, values) for number, values in cleaned
+            if values[self.pk_position] not in inserted
+        ]
+        _, unique_errors = self.check_unique(rejected)
+        explained = {number for number, _ in unique_errors}
+        return errors + unique_errors + [
+            (number, 'строка отклонена базой данных')
+            for number, _ in rejected if number not in explained
+        ]
@@ -1,37 +1,230 @@
 import csv
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import islice
 from pathlib import Path
 
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections, transaction
+from django.db.models import F
 
-from reviews.models import (Category, Comment, Genre, Genre_title, Review,
-                            Title, User)
+from reviews.importers import SqlBatchImporter
+from reviews.models import (Category, Comment, Genre, Genre_title,
+                            ImportCheckpoint, Review, Title, User)
+from reviews.signals import bulk_changed
+from reviews.utils import batched
+
+CSV_DIR = Path('static', 'data')
+STAGES = (
+    (
+        ('category.csv', Category, {}),
+        ('genre.csv', Genre, {}),
+        ('users.csv', User, {}),
+    ),
+    (
+        ('titles.csv', Title, {'category': 'category_id'}),
+    ),
+    (
+        ('genre_title.csv', Genre_title, {}),
+        ('review.csv', Review, {'author': 'author_id'}),
+    ),
+    (
+        ('comments.csv', Comment, {'author': 'author_id'}),
+    ),
+)
+CHECKSUM_CHUNK = 1 << 20
+SHOWN_ERRORS = 10
+
+
+def file_checksum(path):
+    checksum = hashlib.sha256()
+    with open(path, mode='rb') as f:
+        while chunk := f.read(CHECKSUM_CHUNK):
+            checksum.update(chunk)
+    return checksum.hexdigest()
+
+
+def read_rows(path, replace, start=0):
+    with open(path, mode='r', encoding='utf8') as f:
+        for row in islice(csv.DictReader(f), start, None):
+            for old, new in replace.items():
+                row[new] = row.pop(old)
+            yield row
 
 
 class Command(BaseCommand):
+    help = 'Загружает данные из CSV-файлов.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', type=Path, default=CSV_DIR)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--workers', type=int, default=3,
+            help='Сколько независимых файлов загружать одновременно.'
+        )
+        parser.add_argument(
+            '--engine', choices=('sql', 'orm'), default='sql',
+            help='sql — executemany без создания моделей, orm — bulk_create.'
+        )
+        parser.add_argument(
+            '--restart', action='store_true',
+            help='Начать загрузку заново, не используя контрольные точки.'
+        )
+        parser.add_argument(
+            '--verify', action='store_true',
+            help='Сверить базу с файлами, ничего не загружая.'
+        )
+
+    def get_checkpoint(self, file, checksum):
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(
+            file=file, defaults={'checksum': checksum}
+        )
+        if checkpoint.checksum != checksum:
+            checkpoint.checksum = checksum
+            checkpoint.rows = checkpoint.batches = 0
+            checkpoint.completed = False
+            checkpoint.save()
+        elif checkpoint.rows and not checkpoint.completed:
+            self.stdout.write(
+                f'{file}: продолжение с пачки {checkpoint.batches + 1}, '
+                f'строки {checkpoint.rows + 1}'
+            )
+        return checkpoint
+
+    def import_file(self, file, model, replace):
+        path = Path(self.path, file)
+        started = time.perf_counter()
+        counter = skipped = 0
+        checksum = file_checksum(path)
+        try:
+            with self.write_lock:
+                checkpoint = self.get_checkpoint(file, checksum)
+            if checkpoint.completed:
+                self.stdout.write(f'{file}: уже загружен')
+                return
+            rows = enumerate(
+                read_rows(path, replace, checkpoint.rows), checkpoint.rows + 1
+            )
+            for batch in batched(rows, self.batch_size):
+                errors = self.write_batch(model, batch, checkpoint)
+                counter += len(batch)
+                for number, message in errors:
+                    skipped += 1
+                    if skipped <= SHOWN_ERRORS:
+                        self.stderr.write(
+                            f'{file}, строка {number}: {message}'
+                        )
+            with self.write_lock:
+                ImportCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                    completed=True
+                )
+        finally:
+            connections.close_all()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f'{file}: {counter} строк за {elapsed:.2f} с '
+            f'({counter / elapsed if elapsed else counter:.0f} строк/с)'
+            + (f', пропущено {skipped}' if skipped else '')
+        )
+
+    def write_batch(self, model, batch, checkpoint):
+        errors = []
+        if self.engine == 'orm':
+            objects = [model(**row) for _, row in batch]
+        else:
+            if model not in self.importers:
+                self.importers[model] = SqlBatchImporter(model, batch[0][1])
+            importer = self.importers[model]
+            cleaned, errors = importer.clean_rows(
+                (number, row.values()) for number, row in batch
+            )
+        with self.write_lock, transaction.atomic():
+            if self.engine == 'orm':
+                model.objects.bulk_create(objects, ignore_conflicts=True)
+            else:
+                errors += importer.insert(cleaned)
+            bulk_changed.send(sender=model)
+            ImportCheckpoint.objects.filter(pk=checkpoint.pk).update(
+                rows=F('rows') + len(batch),
+                batches=F('batches') + 1,
+            )
+        return sorted(errors)
+
+    def get_verified_fields(self, model, columns):
+        # Даты с auto_now_add при загрузке заполняются заново,
+        # поэтому со значениями из файла их не сравниваем.
+        return [model._meta.pk] + [
+            field for field in map(model._meta.get_field, columns)
+            if not field.primary_key
+            and not getattr(field, 'auto_now_add', False)
+        ]
+
+    def verify_file(self, file, model, replace):
+        path = Path(self.path, file)
+        total = missing = different = 0
+        for batch in batched(read_rows(path, replace), self.batch_size):
+            fields = self.get_verified_fields(model, batch[0])
+            names = [field.attname for field in fields]
+            stored = {
+                row[0]: row for row in model.objects.filter(
+                    pk__in=[row['id'] for row in batch]
+                ).values_list(*names)
+            }
+            for row in batch:
+                source = tuple(
+                    field.to_python(row[field.attname]) for field in fields
+                )
+                total += 1
+                if source[0] not in stored:
+                    missing += 1
+                elif stored[source[0]] != source:
+                    different += 1
+
+        checkpoint = ImportCheckpoint.objects.filter(file=file).first()
+        changed = (
+            checkpoint is not None
+            and checkpoint.checksum != file_checksum(path)
+        )
+        status = 'OK' if not (missing or different or changed) else 'ОШИБКА'
+        self.stdout.write(
+            f'{file}: {status}, строк в файле {total}, '
+            f'отсутствует {missing}, отличается {different}'
+            + (', файл изменён после загрузки' if changed else '')
+        )
+        return status == 'OK'
 
     def handle(self, *args, **kwargs):
-        CSV_DIR = Path('static', 'data')
-        TITLES = (
-            ('category.csv', Category, {}),
-            ('genre.csv', Genre, {}),
-            ('users.csv', User, {}),
-            ('titles.csv', Title, {'category': 'category_id'}),
-            ('genre_title.csv', Genre_title, {}),
-            ('review.csv', Review, {'author': 'author_id'}),
-            ('comments.csv', Comment, {'author': 'author_id'}),
-        )
-        for file, model, replace in TITLES:
-            with open(Path(CSV_DIR, file), mode='r', encoding='utf8') as f:
-                reader = csv.DictReader(f)
-                counter = 0
-                objects_to_create = []
-                for row in reader:
-                    counter += 1
-                    args = dict(**row)
-                    if replace:
-                        for old, new in replace.items():
-                            args[new] = args.pop(old)
-                    objects_to_create.append(model(**args))
-                model.objects.bulk_create(objects_to_create,
-                                          ignore_conflicts=True)
+        self.path = kwargs['path']
+        self.batch_size = kwargs['batch_size']
+        if kwargs['verify']:
+            results = [
+                self.verify_file(*source)
+                for stage in STAGES for source in stage
+            ]
+            if not all(results):
+                raise CommandError('Данные в базе не совпадают с файлами.')
+            return
+
+        self.engine = kwargs['engine']
+        self.importers = {}
+        if kwargs['restart']:
+            ImportCheckpoint.objects.all().delete()
+        # SQLite допускает только одного писателя: файлы читаются
+        # параллельно, а пачки записываются по очереди.
+        self.write_lock = (
+            threading.Lock() if connection.vendor == 'sqlite'
+            else nullcontext()
+        )
+        with ThreadPoolExecutor(max_workers=kwargs['workers']) as executor:
+            for stage in STAGES:
+                for future in [
+                    executor.submit(self.import_file, *source)
+                    for source in stage
+                ]:
+                    future.result()
+        call_command('recalculate_ratings', stdout=self.stdout)
         self.stdout.write("Все данные загружены!")
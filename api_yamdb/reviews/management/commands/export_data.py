@@ -0,0 +1,40 @@
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from reviews.exporters import (EXPORT_CHUNK_SIZE, EXPORT_FORMATS, EXPORTS,
+                               export_lines)
+
+
+class Command(BaseCommand):
+    help = 'Выгружает данные в CSV или NDJSON, по файлу на таблицу.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', type=Path, default=Path('export'))
+        parser.add_argument(
+            '--format', dest='file_format', choices=EXPORT_FORMATS,
+            default='csv'
+        )
+        parser.add_argument(
+            '--table', dest='tables', action='append', choices=EXPORTS,
+            help='Можно указать несколько раз, по умолчанию — все таблицы.'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE
+        )
+
+    def handle(self, *args, **kwargs):
+        output = kwargs['output']
+        output.mkdir(parents=True, exist_ok=True)
+        file_format = kwargs['file_format']
+        for name in kwargs['tables'] or EXPORTS:
+            started = time.perf_counter()
+            path = Path(output, f'{name}.{file_format}')
+            with open(path, mode='w', encoding='utf8', newline='') as f:
+                f.writelines(
+                    export_lines(name, file_format, kwargs['chunk_size'])
+                )
+            self.stdout.write(
+                f'{path}: {time.perf_counter() - started:.2f} с'
+            )
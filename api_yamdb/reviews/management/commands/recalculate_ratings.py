@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+from reviews.models import Review, Title
+from reviews.signals import bulk_changed
+
+
+def rating_subquery(aggregate):
+    return Coalesce(
+        Subquery(
+            Review.objects.filter(
+                title=OuterRef('pk')
+            ).order_by().values('title').annotate(
+                value=aggregate
+            ).values('value')
+        ),
+        0
+    )
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает сохранённые рейтинги всех произведений.'
+
+    @transaction.atomic
+    def handle(self, *args, **kwargs):
+        updated = Title.objects.update(
+            rating_sum=rating_subquery(Sum('score')),
+            rating_count=rating_subquery(Count('id')),
+        )
+        bulk_changed.send(sender=Title)
+        self.stdout.write(f'Рейтинги пересчитаны: {updated}')
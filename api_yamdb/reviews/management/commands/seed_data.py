@@ -0,0 +1,135 @@
+import math
+import random
+import time
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from reviews.models import (Category, Comment, Genre, Genre_title, Review,
+                            Title, User)
+from reviews.signals import bulk_changed
+from reviews.utils import batched
+
+WORDS = (
+    'фильм', 'книга', 'сюжет', 'герой', 'финал', 'музыка', 'режиссёр',
+    'актёр', 'сцена', 'история', 'автор', 'жанр', 'роман', 'песня',
+    'отличный', 'скучный', 'яркий', 'странный', 'добрый', 'мрачный',
+)
+
+
+class Command(BaseCommand):
+    help = 'Заполняет базу синтетическими данными заданного объёма.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--reviews', type=int, default=10_000)
+        parser.add_argument('--titles', type=int)
+        parser.add_argument('--comments', type=int)
+        parser.add_argument('--users', type=int, default=100)
+        parser.add_argument('--categories', type=int, default=10)
+        parser.add_argument('--genres', type=int, default=30)
+        parser.add_argument('--batch-size', type=int, default=5_000)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def text(self, words):
+        return ' '.join(self.random.choices(WORDS, k=words)).capitalize()
+
+    def create(self, model, objects):
+        started = time.perf_counter()
+        total = 0
+        for batch in batched(objects, self.batch_size):
+            with transaction.atomic():
+                model.objects.bulk_create(batch, batch_size=self.batch_size)
+                bulk_changed.send(sender=model)
+            total += len(batch)
+        self.stdout.write(
+            f'{model._meta.verbose_name_plural}: {total} '
+            f'за {time.perf_counter() - started:.1f} с'
+        )
+        return total
+
+    def create_named(self, model, count):
+        prefix = model._meta.model_name
+        existing = model.objects.filter(slug__startswith=f'seed-{prefix}-')
+        start = existing.count()
+        self.create(model, (
+            model(
+                name=f'{prefix} {number}', slug=f'seed-{prefix}-{number}'
+            )
+            for number in range(start, start + count)
+        ))
+        return list(
+            model.objects.filter(
+                slug__startswith=f'seed-{prefix}-'
+            ).values_list('id', flat=True)
+        )
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        reviews = options['reviews']
+        titles = options['titles'] or max(1, reviews // 20)
+        comments = options['comments']
+        if comments is None:
+            comments = reviews
+        users = max(options['users'], math.ceil(reviews / titles))
+
+        first_user = (User.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0) + 1
+        self.create(User, (
+            User(
+                id=first_user + number,
+                username=f'seed_user_{first_user + number}',
+                email=f'seed_user_{first_user + number}@yamdb.fake',
+            )
+            for number in range(users)
+        ))
+        category_ids = self.create_named(Category, options['categories'])
+        genre_ids = self.create_named(Genre, options['genres'])
+
+        first_title = (Title.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0) + 1
+        title_ids = range(first_title, first_title + titles)
+        self.create(Title, (
+            Title(
+                id=title_id,
+                name=self.text(3),
+                year=self.random.randint(1900, 2020),
+                description=self.text(20),
+                category_id=self.random.choice(category_ids),
+            )
+            for title_id in title_ids
+        ))
+        self.create(Genre_title, (
+            Genre_title(title_id=title_id, genre_id=genre_id)
+            for title_id in title_ids
+            for genre_id in self.random.sample(
+                genre_ids, min(2, len(genre_ids))
+            )
+        ))
+
+        first_review = (Review.objects.order_by('-id').values_list(
+            'id', flat=True
+        ).first() or 0) + 1
+        self.create(Review, (
+            Review(
+                id=first_review + number,
+                title_id=title_ids[number % titles],
+                author_id=first_user + number // titles,
+                text=self.text(30),
+                score=self.random.randint(1, 10),
+            )
+            for number in range(reviews)
+        ))
+        if reviews:
+            self.create(Comment, (
+                Comment(
+                    review_id=first_review + self.random.randrange(reviews),
+                    author_id=first_user + self.random.randrange(users),
+                    text=self.text(15),
+                )
+                for _ in range(comments)
+            ))
+        call_command('recalculate_ratings', stdout=self.stdout)
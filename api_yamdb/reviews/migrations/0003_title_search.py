@@ -0,0 +1,52 @@
+from django.db import migrations
+
+TITLE_SEARCH_TABLE = 'reviews_title_search'
+CREATE_TITLE_SEARCH = (
+    f"CREATE VIRTUAL TABLE {TITLE_SEARCH_TABLE} USING fts5("
+    "name, content='reviews_title', content_rowid='id', "
+    "tokenize='trigram')",
+    f"CREATE TRIGGER {TITLE_SEARCH_TABLE}_ai AFTER INSERT ON reviews_title "
+    f"BEGIN INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name) "
+    "VALUES (new.id, new.name); END",
+    f"CREATE TRIGGER {TITLE_SEARCH_TABLE}_ad AFTER DELETE ON reviews_title "
+    f"BEGIN INSERT INTO {TITLE_SEARCH_TABLE}"
+    f"({TITLE_SEARCH_TABLE}, rowid, name) "
+    "VALUES ('delete', old.id, old.name); END",
+    f"CREATE TRIGGER {TITLE_SEARCH_TABLE}_au AFTER UPDATE OF name "
+    f"ON reviews_title BEGIN INSERT INTO {TITLE_SEARCH_TABLE}"
+    f"({TITLE_SEARCH_TABLE}, rowid, name) "
+    "VALUES ('delete', old.id, old.name); "
+    f"INSERT INTO {TITLE_SEARCH_TABLE}(rowid, name) "
+    "VALUES (new.id, new.name); END",
+    f"INSERT INTO {TITLE_SEARCH_TABLE}({TITLE_SEARCH_TABLE}) "
+    "VALUES ('rebuild')",
+)
+DROP_TITLE_SEARCH = (
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_ai',
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_ad',
+    f'DROP TRIGGER IF EXISTS {TITLE_SEARCH_TABLE}_au',
+    f'DROP TABLE IF EXISTS {TITLE_SEARCH_TABLE}',
+)
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for statement in statements:
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0002_title_rating'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sqlite(CREATE_TITLE_SEARCH),
+            run_sqlite(DROP_TITLE_SEARCH),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+TOKENIZER = 'unicode61 remove_diacritics 2'
+SEARCH_TABLES = (
+    ('reviews_title_text', 'reviews_title', ('name', 'description')),
+    ('reviews_review_text', 'reviews_review', ('text',)),
+    ('reviews_comment_text', 'reviews_comment', ('text',)),
+)
+
+
+def create_statements(table, source, columns):
+    names = ', '.join(columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    insert = f'INSERT INTO {table}(rowid, {names}) VALUES (new.id, {new});'
+    delete = (
+        f'INSERT INTO {table}({table}, rowid, {names}) '
+        f"VALUES ('delete', old.id, {old});"
+    )
+    return (
+        f'CREATE VIRTUAL TABLE {table} USING fts5({names}, '
+        f"content='{source}', content_rowid='id', tokenize='{TOKENIZER}')",
+        f'CREATE TRIGGER {table}_ai AFTER INSERT ON {source} '
+        f'BEGIN {insert} END',
+        f'CREATE TRIGGER {table}_ad AFTER DELETE ON {source} '
+        f'BEGIN {delete} END',
+        f'CREATE TRIGGER {table}_au AFTER UPDATE OF {names} ON {source} '
+        f'BEGIN {delete} {insert} END',
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    )
+
+
+def drop_statements(table, source, columns):
+    return (
+        f'DROP TRIGGER IF EXISTS {table}_ai',
+        f'DROP TRIGGER IF EXISTS {table}_ad',
+        f'DROP TRIGGER IF EXISTS {table}_au',
+        f'DROP TABLE IF EXISTS {table}',
+    )
+
+
+def run_sqlite(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'sqlite':
+            return
+        for search_table in SEARCH_TABLES:
+            for statement in statements(*search_table):
+                schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_title_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_sqlite(create_statements),
+            run_sqlite(drop_statements),
+        ),
+    ]
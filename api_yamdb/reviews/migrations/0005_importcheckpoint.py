@@ -0,0 +1,30 @@
+# Generated by Django 3.2 on 2026-10-18 20:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0004_text_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.CharField(max_length=255, unique=True, verbose_name='Файл')),
+                ('checksum', models.CharField(max_length=64, verbose_name='Контрольная сумма файла')),
+                ('rows', models.PositiveIntegerField(default=0, verbose_name='Загружено строк')),
+                ('batches', models.PositiveIntegerField(default=0, verbose_name='Загружено пачек')),
+                ('completed', models.BooleanField(default=False, verbose_name='Загрузка завершена')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Дата обновления')),
+            ],
+            options={
+                'verbose_name': 'Контрольная точка импорта',
+                'verbose_name_plural': 'Контрольные точки импорта',
+                'ordering': ('file',),
+            },
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 
 from constants import CATEGORY_GENRE_NAME_LEN, CATEGORY_GENRE_SLUG_LEN
 from users.models import User
@@ -55,6 +55,16 @@ class Title(models.Model):
         verbose_name='Жанр',
         blank=True,
     )
+    rating_sum = models.PositiveIntegerField(
+        'Сумма оценок',
+        default=0,
+        editable=False,
+    )
+    rating_count = models.PositiveIntegerField(
+        'Количество оценок',
+        default=0,
+        editable=False,
+    )
 
     class Meta:
         ordering = ('name',)
@@ -65,6 +75,12 @@ class Title(models.Model):
     def __str__(self):
         return self.name
 
+    @property
+    def rating(self):
+        if not self.rating_count:
+            return None
+        return self.rating_sum // self.rating_count
+
 
 class Genre_title(models.Model):
     title = models.ForeignKey(
@@ -135,6 +151,14 @@ class Review(AuthorTextPubDate):
             )
         ]
 
+    @transaction.atomic
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+
+    @transaction.atomic
+    def delete(self, *args, **kwargs):
+        return super().delete(*args, **kwargs)
+
 
 class Comment(AuthorTextPubDate):
     review = models.ForeignKey(
@@ -146,3 +170,20 @@ class Comment(AuthorTextPubDate):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
         default_related_name = 'comments'
+
+
+class ImportCheckpoint(models.Model):
+    file = models.CharField('Файл', max_length=255, unique=True)
+    checksum = models.CharField('Контрольная сумма файла', max_length=64)
+    rows = models.PositiveIntegerField('Загружено строк', default=0)
+    batches = models.PositiveIntegerField('Загружено пачек', default=0)
+    completed = models.BooleanField('Загрузка завершена', default=False)
+    updated_at = models.DateTimeField('Дата обновления', auto_now=True)
+
+    class Meta:
+        ordering = ('file',)
+        verbose_name = 'Контрольная точка импорта'
+        verbose_name_plural = 'Контрольные точки импорта'
+
+    def __str__(self):
+        return f'{self.file}: {self.rows}'
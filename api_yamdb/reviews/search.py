@@ -0,0 +1,130 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+TITLE_SEARCH_TABLE = 'reviews_title_search'
+TRIGRAM_LENGTH = 3
+
+
+def fts_phrase(value):
+    return '"{}"'.format(value.replace('"', '""'))
+
+
+def filter_titles_by_name(queryset, value):
+    if connection.vendor != 'sqlite' or len(value) < TRIGRAM_LENGTH:
+        return queryset.filter(name__contains=value)
+    return queryset.filter(id__in=RawSQL(
+        f'SELECT rowid FROM {TITLE_SEARCH_TABLE} WHERE name MATCH %s',
+        (fts_phrase(value),)
+    ))
+
+
+SEARCH_QUERY = (
+    "SELECT '{type}' AS type, {id} AS id, {title_id} AS title_id, "
+    "{review_id} AS review_id, bm25({table}{weights}) AS rank "
+    "FROM {table} {joins} WHERE {table} MATCH %s"
+)
+SNIPPET_QUERY = (
+    "SELECT rowid, snippet({table}, -1, '', '', '…', {words}) "
+    "FROM {table} WHERE {table} MATCH %s AND rowid IN ({ids})"
+)
+SEARCH_SOURCES = {
+    'title': {
+        'table': 'reviews_title_text',
+        'id': 't.id',
+        'title_id': 't.id',
+        'review_id': 'NULL',
+        'weights': ', 10.0, 1.0',
+        'joins': 'JOIN reviews_title t ON t.id = reviews_title_text.rowid',
+    },
+    'review': {
+        'table': 'reviews_review_text',
+        'id': 'r.id',
+        'title_id': 'r.title_id',
+        'review_id': 'NULL',
+        'weights': '',
+        'joins': 'JOIN reviews_review r ON r.id = reviews_review_text.rowid',
+    },
+    'comment': {
+        'table': 'reviews_comment_text',
+        'id': 'c.id',
+        'title_id': 'r.title_id',
+        'review_id': 'c.review_id',
+        'weights': '',
+        'joins': (
+            'JOIN reviews_comment c ON c.id = reviews_comment_text.rowid '
+            'JOIN reviews_review r ON r.id = c.review_id'
+        ),
+    },
+}
+SEARCH_COLUMNS = ('type', 'id', 'title_id', 'review_id', 'rank')
+SNIPPET_WORDS = 16
+
+
+def fts_query(value):
+    return ' '.join(fts_phrase(word) for word in re.findall(r'\w+', value))
+
+
+def search_text(value, types, limit, offset=0):
+    query = fts_query(value)
+    if not query:
+        return []
+    if connection.vendor != 'sqlite':
+        return search_text_fallback(value, types, limit, offset)
+    sql = ' UNION ALL '.join(
+        SEARCH_QUERY.format(type=search_type, **SEARCH_SOURCES[search_type])
+        for search_type in types
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT * FROM ({sql}) ORDER BY rank, type, id '
+            'LIMIT %s OFFSET %s',
+            [query] * len(types) + [limit, offset]
+        )
+        results = [
+            dict(zip(SEARCH_COLUMNS, row)) for row in cursor.fetchall()
+        ]
+        for search_type in types:
+            found = {
+                result['id']: result for result in results
+                if result['type'] == search_type
+            }
+            if not found:
+                continue
+            cursor.execute(
+                SNIPPET_QUERY.format(
+                    table=SEARCH_SOURCES[search_type]['table'],
+                    words=SNIPPET_WORDS,
+                    ids=', '.join(['%s'] * len(found)),
+                ),
+                [query, *found]
+            )
+            for pk, text in cursor.fetchall():
+                found[pk]['text'] = text
+    return results
+
+
+def search_text_fallback(value, types, limit, offset):
+    from .models import Comment, Review, Title
+
+    querysets = {
+        'title': Title.objects.filter(
+            Q(name__icontains=value) | Q(description__icontains=value)
+        ).values_list('id', 'id', 'name'),
+        'review': Review.objects.filter(
+            text__icontains=value
+        ).values_list('id', 'title_id', 'text'),
+        'comment': Comment.objects.filter(
+            text__icontains=value
+        ).values_list('id', 'review__title_id', 'text', 'review_id'),
+    }
+    results = []
+    for search_type in types:
+        for row in querysets[search_type][:offset + limit]:
+            pk, title_id, text, *review_id = row
+            results.append(dict(zip(SEARCH_COLUMNS, (
+                search_type, pk, title_id, next(iter(review_id), None), 0
+            )), text=text))
+    return results[offset:offset + limit]
@@ -0,0 +1,45 @@
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .models import Review, Title
+
+# Отправляется после записи в обход сигналов моделей: bulk_create,
+# update по queryset, сырой SQL. sender — модель, которую изменили.
+bulk_changed = Signal()
+
+
+def change_rating(title_id, score, count):
+    Title.objects.filter(pk=title_id).update(
+        rating_sum=F('rating_sum') + score,
+        rating_count=F('rating_count') + count,
+    )
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_score(sender, instance, **kwargs):
+    instance._previous_score = None
+    if instance.pk:
+        instance._previous_score = Review.objects.filter(
+            pk=instance.pk
+        ).values_list('title_id', 'score').first()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_score', None)
+    if created or previous is None:
+        change_rating(instance.title_id, instance.score, 1)
+        return
+    title_id, score = previous
+    if title_id == instance.title_id:
+        if score != instance.score:
+            change_rating(title_id, instance.score - score, 0)
+        return
+    change_rating(title_id, -score, -1)
+    change_rating(instance.title_id, instance.score, 1)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    change_rating(instance.title_id, -instance.score, -1)
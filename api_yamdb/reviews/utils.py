@@ -0,0 +1,23 @@
+from itertools import islice
+
+from django.db import connection
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def bulk_create_with_ids(model, objects, **filters):
+    model.objects.bulk_create(objects)
+    if objects and not connection.features.can_return_rows_from_bulk_insert:
+        # Вызывается внутри транзакции: запись в таблицу захвачена нами,
+        # поэтому последние id принадлежат только что вставленным строкам.
+        ids = model.objects.filter(**filters).order_by(
+            '-pk'
+        ).values_list('pk', flat=True)[:len(objects)]
+        for obj, pk in zip(objects, reversed(ids)):
+            obj.pk = pk
+            obj._state.adding = False
+    return objects
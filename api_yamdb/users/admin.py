@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.contrib.auth import get_user_model
 
+from .models import OutboxEmail
+
 User = get_user_model()
 
 
@@ -16,3 +18,14 @@ class CustomUserAdmin(BaseUserAdmin):
 
 
 admin.site.register(User, CustomUserAdmin)
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = (
+        'id', 'subject', 'recipients', 'created_at', 'attempts', 'sent_at'
+    )
+    list_filter = ('sent_at',)
+    readonly_fields = ('created_at',)
+
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
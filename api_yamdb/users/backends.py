@@ -0,0 +1,17 @@
+from django.core.mail.backends.base import BaseEmailBackend
+
+from .models import OutboxEmail
+
+
+class OutboxEmailBackend(BaseEmailBackend):
+    def send_messages(self, email_messages):
+        OutboxEmail.objects.bulk_create(
+            OutboxEmail(
+                subject=message.subject,
+                body=message.body,
+                from_email=message.from_email,
+                recipients=message.recipients(),
+            )
+            for message in email_messages
+        )
+        return len(email_messages)
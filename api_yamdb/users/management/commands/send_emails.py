@@ -0,0 +1,97 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from django.db.models import F
+from django.utils import timezone
+
+from users.models import OutboxEmail
+
+
+class Command(BaseCommand):
+    help = 'Отправляет письма из очереди пачками с повторными попытками.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE
+        )
+        parser.add_argument(
+            '--max-attempts', type=int,
+            default=settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+        )
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Проверять очередь каждые --interval секунд.'
+        )
+        parser.add_argument('--interval', type=float, default=5)
+
+    def handle(self, *args, **options):
+        while True:
+            while self.send_batch(
+                options['batch_size'], options['max_attempts']
+            ) == options['batch_size']:
+                pass
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+
+    def claim_batch(self, batch_size, max_attempts):
+        now = timezone.now()
+        claim = uuid.uuid4().hex
+        pending = OutboxEmail.objects.filter(
+            sent_at__isnull=True,
+            next_attempt_at__lte=now,
+            attempts__lt=max_attempts,
+        )
+        # Одним UPDATE письма откладываются на время отправки: параллельный
+        # обработчик их уже не выберет, а после сбоя они вернутся в очередь.
+        pending.filter(
+            pk__in=pending.values('pk')[:batch_size]
+        ).update(
+            claimed_by=claim,
+            attempts=F('attempts') + 1,
+            next_attempt_at=now + timedelta(
+                seconds=settings.EMAIL_OUTBOX_CLAIM_TIMEOUT
+            ),
+        )
+        return list(OutboxEmail.objects.filter(
+            claimed_by=claim, sent_at__isnull=True
+        ))
+
+    def send_batch(self, batch_size, max_attempts):
+        emails = self.claim_batch(batch_size, max_attempts)
+        if not emails:
+            return 0
+
+        now = timezone.now()
+        sent = 0
+        with get_connection(settings.EMAIL_OUTBOX_BACKEND) as connection:
+            for email in emails:
+                try:
+                    EmailMessage(
+                        email.subject,
+                        email.body,
+                        email.from_email,
+                        email.recipients,
+                        connection=connection,
+                    ).send()
+                except Exception as error:
+                    email.last_error = str(error)
+                    email.next_attempt_at = now + timedelta(
+                        seconds=settings.EMAIL_OUTBOX_RETRY_DELAY
+                        * 2 ** (email.attempts - 1)
+                    )
+                else:
+                    email.sent_at = timezone.now()
+                    email.last_error = ''
+                    sent += 1
+        OutboxEmail.objects.bulk_update(
+            emails, ('last_error', 'next_attempt_at', 'sent_at')
+        )
+        self.stdout.write(
+            f'Отправлено писем: {sent}, ошибок: {len(emails) - sent}'
+        )
+        return len(emails)
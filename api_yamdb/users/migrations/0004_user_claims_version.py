@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 21:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_outboxemail'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='claims_version',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Версия прав в токенах'),
+        ),
+    ]
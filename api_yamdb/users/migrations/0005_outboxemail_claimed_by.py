@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 21:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0004_user_claims_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='claimed_by',
+            field=models.CharField(blank=True, max_length=32, verbose_name='Обработчик'),
+        ),
+    ]
@@ -1,7 +1,9 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.utils import timezone
 
 from constants import (ADMIN_ROLE, CONFIRMATION_CODE_LENGTH,
+                       EMAIL_SUBJECT_LENGTH, MAX_EMAIL_LENGTH,
                        MAX_USERNAME_LENGTH, MODERATOR_ROLE, USER_ROLE)
 from users.validators import regex_validator
 
@@ -46,6 +48,11 @@ class User(AbstractUser):
         verbose_name='Код подтверждения',
         blank=True
     )
+    claims_version = models.PositiveIntegerField(
+        verbose_name='Версия прав в токенах',
+        default=0,
+        editable=False,
+    )
 
     def __str__(self):
         return self.username
@@ -57,3 +64,60 @@ class User(AbstractUser):
     @property
     def is_moderator(self):
         return self.role == 'moderator'
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField(
+        verbose_name='Тема',
+        max_length=EMAIL_SUBJECT_LENGTH,
+    )
+    body = models.TextField(
+        verbose_name='Текст',
+    )
+    from_email = models.CharField(
+        verbose_name='Отправитель',
+        max_length=MAX_EMAIL_LENGTH,
+    )
+    recipients = models.JSONField(
+        verbose_name='Получатели',
+    )
+    created_at = models.DateTimeField(
+        verbose_name='Дата создания',
+        auto_now_add=True,
+    )
+    next_attempt_at = models.DateTimeField(
+        verbose_name='Следующая попытка',
+        default=timezone.now,
+    )
+    attempts = models.PositiveSmallIntegerField(
+        verbose_name='Количество попыток',
+        default=0,
+    )
+    last_error = models.TextField(
+        verbose_name='Последняя ошибка',
+        blank=True,
+    )
+    sent_at = models.DateTimeField(
+        verbose_name='Дата отправки',
+        blank=True,
+        null=True,
+    )
+    claimed_by = models.CharField(
+        verbose_name='Обработчик',
+        max_length=32,
+        blank=True,
+    )
+
+    class Meta:
+        verbose_name = 'Письмо в очереди'
+        verbose_name_plural = 'Очередь писем'
+        ordering = ('id',)
+        indexes = [
+            models.Index(
+                fields=('sent_at', 'next_attempt_at'),
+                name='outbox_pending_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.subject} → {", ".join(self.recipients)}'
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.utils import create_reviews
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08TitleRating:
+
+    def test_01_rating_follows_review_changes(self, admin_client, admin,
+                                              user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        review_url = f'{title_url}reviews/{reviews[1]["id"]}/'
+
+        response = user_client.patch(review_url, data={'score': 10})
+        assert response.status_code == HTTPStatus.OK
+        assert admin_client.get(title_url).json()['rating'] == 7, (
+            'Проверьте, что после изменения оценки в отзыве рейтинг '
+            'произведения пересчитывается.'
+        )
+
+        response = user_client.delete(review_url)
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert admin_client.get(title_url).json()['rating'] == 5, (
+            'Проверьте, что после удаления отзыва рейтинг произведения '
+            'пересчитывается.'
+        )
+
+        admin_client.delete(f'{title_url}reviews/{reviews[0]["id"]}/')
+        assert admin_client.get(title_url).json()['rating'] is None, (
+            'Проверьте, что у произведения без отзывов рейтинг равен `None`.'
+        )
+
+    def test_02_recalculate_ratings_command(self, admin_client, admin, user,
+                                            user_client):
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        Title.objects.update(rating_sum=0, rating_count=0)
+
+        call_command('recalculate_ratings')
+
+        title = Title.objects.get(pk=titles[0]['id'])
+        assert (title.rating_sum, title.rating_count) == (10, 2), (
+            'Проверьте, что команда `recalculate_ratings` восстанавливает '
+            'сохранённые рейтинги произведений.'
+        )
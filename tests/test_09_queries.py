@@ -0,0 +1,215 @@
+from http import HTTPStatus
+from itertools import count
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import (check_constant_queries, count_queries, create_comments,
+                         create_titles)
+
+
+@pytest.fixture
+def catalogue_factory(db):
+    from reviews.models import Category, Genre, Title
+
+    numbers = count(1)
+
+    def fill():
+        number = next(numbers)
+        category = Category.objects.create(
+            name=f'Категория {number}', slug=f'category-{number}'
+        )
+        genres = [
+            Genre.objects.create(
+                name=f'Жанр {number}-{idx}', slug=f'genre-{number}-{idx}'
+            )
+            for idx in range(2)
+        ]
+        for idx in range(3):
+            title = Title.objects.create(
+                name=f'Произведение {number}-{idx}',
+                year=2000,
+                description='',
+                category=category,
+            )
+            title.genre.set(genres)
+        return title
+
+    return fill
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09QueryCount:
+
+    @pytest.mark.parametrize('url, expected', (
+        ('/api/v1/titles/?limit=50', 3),
+        ('/api/v1/categories/?limit=50', 2),
+        ('/api/v1/genres/?limit=50', 2),
+    ))
+    def test_01_catalogue_list(self, client, catalogue_factory, url,
+                               expected):
+        queries = check_constant_queries(client, url, catalogue_factory)
+        assert queries <= expected, (
+            f'Проверьте, что GET-запрос к `{url}` выполняет не больше '
+            f'{expected} SQL-запросов. Сейчас: {queries}.'
+        )
+
+    def test_02_title_detail(self, client, catalogue_factory):
+        title = catalogue_factory()
+        url = f'/api/v1/titles/{title.id}/'
+        queries = count_queries(client, url)
+        assert queries <= 2, (
+            f'Проверьте, что GET-запрос к `{url}` выполняет не больше 2 '
+            f'SQL-запросов. Сейчас: {queries}.'
+        )
+
+    def test_03_users_list(self, admin_client, django_user_model):
+        numbers = count(1)
+
+        def fill():
+            for _ in range(3):
+                number = next(numbers)
+                django_user_model.objects.create_user(
+                    username=f'user{number}',
+                    email=f'user{number}@yamdb.fake',
+                )
+
+        url = '/api/v1/users/?limit=50'
+        queries = check_constant_queries(admin_client, url, fill)
+        assert queries <= 3, (
+            f'Проверьте, что GET-запрос к `{url}` выполняет не больше 3 '
+            f'SQL-запросов. Сейчас: {queries}.'
+        )
+
+    def test_04_cached_user(self, admin_client, user, user_client):
+        url = '/api/v1/users/me/'
+        assert count_queries(user_client, url) == 1
+        assert count_queries(user_client, url) == 0, (
+            f'Проверьте, что при повторном GET-запросе к `{url}` '
+            'пользователь берётся из кеша.'
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'role': 'moderator'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert user_client.get(url).json()['role'] == 'moderator', (
+            'Проверьте, что кеш пользователя сбрасывается при изменении '
+            'его данных.'
+        )
+
+    def test_05_review_create(self, admin_client, user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        user_client.get('/api/v1/users/me/')
+        data = {'text': 'Отзыв', 'score': 5}
+
+        with CaptureQueriesContext(connection) as context:
+            response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.CREATED
+        title_queries = [
+            query for query in context.captured_queries
+            if query['sql'].startswith('SELECT "reviews_title"')
+        ]
+        assert len(title_queries) == 1, (
+            f'Проверьте, что при POST-запросе к `{url}` произведение '
+            'загружается из базы один раз.'
+        )
+        assert not any(
+            query['sql'].startswith('SELECT (1) AS "a"')
+            for query in context.captured_queries
+        ), (
+            'Проверьте, что повторный отзыв отсекается ограничением '
+            '`unique_author_title`, а не отдельным запросом `exists()`.'
+        )
+
+        response = user_client.post(url, data=data)
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_06_comment_parent_chain(self, admin_client, admin, user,
+                                     user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/'
+        )
+        with CaptureQueriesContext(connection) as context:
+            response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        chain_queries = [
+            query['sql'] for query in context.captured_queries
+            if 'FROM "reviews_review"' in query['sql']
+        ]
+        assert len(chain_queries) == 1 and (
+            '"reviews_review"."title_id"' in chain_queries[0]
+        ), (
+            f'Проверьте, что при GET-запросе к `{url}` отзыв и произведение '
+            'проверяются одним запросом.'
+        )
+
+        other_title = titles[1]['id']
+        for wrong_url in (
+            f'/api/v1/titles/{other_title}/reviews/{reviews[0]["id"]}/'
+            'comments/',
+            f'/api/v1/titles/{other_title}/reviews/{reviews[0]["id"]}/'
+            f'comments/{comments[0]["id"]}/',
+        ):
+            response = admin_client.get(wrong_url)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                'Проверьте, что комментарии недоступны по адресу с чужим '
+                f'`title_id`: `{wrong_url}`.'
+            )
+
+    def test_07_reviews_and_comments_list(self, admin_client, admin,
+                                          django_user_model):
+        from reviews.models import Comment, Review
+
+        titles, _, _ = create_titles(admin_client)
+        first_review = Review.objects.create(
+            title_id=titles[0]['id'], author=admin, text='Отзыв', score=5
+        )
+        numbers = count(1)
+
+        def fill():
+            for _ in range(3):
+                number = next(numbers)
+                author = django_user_model.objects.create_user(
+                    username=f'author{number}',
+                    email=f'author{number}@yamdb.fake',
+                )
+                Review.objects.create(
+                    title_id=titles[0]['id'], author=author,
+                    text=f'Отзыв {number}', score=5
+                )
+                Comment.objects.create(
+                    review=first_review, author=author,
+                    text=f'Комментарий {number}'
+                )
+
+        for url in (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/?limit=50',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{first_review.id}/'
+            'comments/?limit=50',
+        ):
+            queries = check_constant_queries(admin_client, url, fill)
+            assert queries <= 3, (
+                f'Проверьте, что GET-запрос к `{url}` выполняет не больше 3 '
+                f'SQL-запросов. Сейчас: {queries}.'
+            )
+
+    def test_08_review_other_integrity_error(self, admin_client, user_client,
+                                             monkeypatch):
+        from django.db import IntegrityError
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        def broken_save(*args, **kwargs):
+            raise IntegrityError('NOT NULL constraint failed')
+
+        monkeypatch.setattr(Review, 'save', broken_save)
+        with pytest.raises(IntegrityError):
+            user_client.post(url, data={'text': 'Отзыв', 'score': 5})
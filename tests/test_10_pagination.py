@@ -0,0 +1,84 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import count_queries, create_reviews, create_titles
+
+
+def collect_cursor_pages(client, url):
+    results = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+            'статусом 200.'
+        )
+        data = response.json()
+        assert 'count' not in data, (
+            'Проверьте, что в режиме курсорной пагинации не выполняется '
+            'подсчёт общего количества объектов.'
+        )
+        results.extend(data['results'])
+        url = data['next']
+    return results
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Pagination:
+
+    def test_01_titles_cursor(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        results = collect_cursor_pages(
+            client, '/api/v1/titles/?cursor=&limit=1'
+        )
+        assert [title['id'] for title in results] == [
+            title['id'] for title in sorted(titles, key=lambda x: x['name'])
+        ], (
+            'Проверьте, что курсорная пагинация `/api/v1/titles/` '
+            'возвращает все произведения в порядке `name, id`.'
+        )
+
+    def test_02_reviews_cursor(self, client, admin_client, admin, user,
+                               user_client, moderator, moderator_client):
+        author_map = {
+            admin: admin_client,
+            user: user_client,
+            moderator: moderator_client
+        }
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/?cursor=&limit=2'
+        results = collect_cursor_pages(client, url)
+        assert [review['id'] for review in results] == [
+            review['id'] for review in reversed(reviews)
+        ], (
+            'Проверьте, что курсорная пагинация отзывов возвращает все '
+            'отзывы начиная с самых новых.'
+        )
+
+    def test_03_cached_count(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/'
+        assert admin_client.get(url).json()['count'] == len(titles)
+        assert count_queries(admin_client, url) == 2, (
+            f'Проверьте, что повторный GET-запрос к `{url}` берёт общее '
+            'количество объектов из кеша.'
+        )
+
+        title = titles[0]
+        response = admin_client.delete(f'{url}{title["id"]}/')
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get(url).json()['count'] == len(titles) - 1, (
+            'Проверьте, что кешированное количество объектов сбрасывается '
+            'после изменения данных.'
+        )
+
+    def test_04_count_opt_out(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?count=false&limit=1'
+        assert count_queries(client, url) == 2
+        data = client.get(url).json()
+        assert 'count' not in data and len(data['results']) == 1, (
+            'Проверьте, что при `?count=false` ответ не содержит ключа '
+            '`count`.'
+        )
+        assert data['next'] and client.get(data['next']).json()['next'] is None
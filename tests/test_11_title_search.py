@@ -0,0 +1,59 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_titles
+
+
+def get_title_ids(client, url):
+    response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со статусом '
+        '200.'
+    )
+    return {title['id'] for title in response.json()['results']}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test11TitleSearch:
+
+    def test_01_name_substring(self, client, admin_client):
+        titles, _, _ = create_titles(admin_client)
+        url = '/api/v1/titles/?name={}'
+        assert get_title_ids(client, url.format('ОРЕШ')) == {
+            titles[1]['id']
+        }, (
+            'Проверьте, что фильтр `name` находит произведения по части '
+            'названия без учёта регистра.'
+        )
+        assert get_title_ids(client, url.format('Те')) == {titles[0]['id']}
+
+        response = admin_client.patch(
+            f'/api/v1/titles/{titles[0]["id"]}/', data={'name': 'Чужой'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert not get_title_ids(client, url.format('Терминатор')), (
+            'Проверьте, что поисковый индекс обновляется при изменении '
+            'названия произведения.'
+        )
+        assert get_title_ids(client, url.format('Чужой')) == {
+            titles[0]['id']
+        }
+
+    def test_02_exact_slug(self, client, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        url = '/api/v1/titles/?{}={}'
+        assert get_title_ids(
+            client, url.format('genre', genres[2]['slug'])
+        ) == {titles[1]['id']}
+        assert not get_title_ids(
+            client, url.format('genre', genres[2]['slug'][:-1])
+        ), (
+            'Проверьте, что фильтр `genre` сравнивает slug жанра целиком.'
+        )
+        assert not get_title_ids(
+            client, url.format('category', categories[0]['slug'][1:])
+        ), (
+            'Проверьте, что фильтр `category` сравнивает slug категории '
+            'целиком.'
+        )
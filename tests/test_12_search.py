@@ -0,0 +1,51 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_comments
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12Search:
+
+    def test_01_search(self, client, admin_client, admin, user, user_client):
+        author_map = {admin: admin_client, user: user_client}
+        comments, reviews, titles = create_comments(admin_client, author_map)
+        url = '/api/v1/search/'
+
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            f'Проверьте, что GET-запрос к `{url}` без параметра `q` '
+            'возвращает ответ со статусом 400.'
+        )
+
+        response = client.get(url, {'q': 'number'})
+        assert response.status_code == HTTPStatus.OK
+        found = {
+            (item['type'], item['id']) for item in response.json()['results']
+        }
+        assert found == {
+            *(('review', review['id']) for review in reviews),
+            *(('comment', comment['id']) for comment in comments),
+        }, (
+            f'Проверьте, что GET-запрос к `{url}` находит отзывы и '
+            'комментарии по словам из текста.'
+        )
+
+        response = client.get(url, {'q': 'орешек', 'type': 'title'})
+        assert [
+            (item['type'], item['id'], item['title_id'])
+            for item in response.json()['results']
+        ] == [('title', titles[1]['id'], titles[1]['id'])]
+
+        response = client.get(
+            url, {'q': 'comment', 'type': 'comment', 'limit': 1}
+        )
+        data = response.json()
+        assert len(data['results']) == 1 and data['next'], (
+            f'Проверьте, что GET-запрос к `{url}` поддерживает `limit`.'
+        )
+        result = data['results'][0]
+        assert result['review_id'] == reviews[0]['id']
+        assert result['title_id'] == titles[0]['id']
+        assert client.get(data['next']).json()['next'] is None
@@ -0,0 +1,96 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+
+def get_claims_client(user):
+    from api.tokens import RoleAccessToken
+
+    client = APIClient()
+    client.credentials(
+        HTTP_AUTHORIZATION=f'Bearer {RoleAccessToken.for_user(user)}'
+    )
+    return client
+
+
+@pytest.mark.django_db(transaction=True)
+class Test13TokenClaims:
+
+    def test_01_permissions_without_user_query(self, admin):
+        client = get_claims_client(admin)
+        url = '/api/v1/categories/'
+        with CaptureQueriesContext(connection) as context:
+            response = client.post(url, data={'name': 'Фильм', 'slug': 'f'})
+        assert response.status_code == HTTPStatus.CREATED
+        assert not any(
+            'users_user' in query['sql']
+            for query in context.captured_queries
+        ), (
+            f'Проверьте, что POST-запрос администратора к `{url}` '
+            'проверяет права по данным токена, не обращаясь к таблице '
+            'пользователей.'
+        )
+
+    def test_02_role_downgrade_revokes_claims(self, admin, admin_client,
+                                              moderator):
+        url = '/api/v1/users/'
+        response = get_claims_client(moderator).get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN
+
+        client = get_claims_client(admin)
+        assert client.get(url).status_code == HTTPStatus.OK
+        response = admin_client.patch(
+            f'{url}{admin.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после понижения роли пользователя права из '
+            'ранее выданного токена больше не действуют.'
+        )
+
+    def test_03_revocation_survives_cache_loss(self, admin, admin_client):
+        from django.core.cache import caches
+
+        url = '/api/v1/users/'
+        client = get_claims_client(admin)
+        assert client.get(url).status_code == HTTPStatus.OK
+        response = admin_client.patch(
+            f'{url}{admin.username}/', data={'role': 'user'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        for cache in caches.all():
+            cache.clear()
+        response = client.get(url)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что отзыв прав из токена не теряется при очистке '
+            'кеша (другой процесс, вытеснение).'
+        )
+
+    def test_04_me_patch_ignores_stale_cached_user(self, admin):
+        from django.core.cache import cache
+
+        from api.authentication import USER_CACHE_KEY
+        from users.models import User
+
+        client = get_claims_client(admin)
+        assert client.get('/api/v1/users/me/').status_code == HTTPStatus.OK
+        stale = User.objects.get(pk=admin.pk)
+        # Другой процесс понизил роль, а кеш этого процесса ещё старый.
+        User.objects.filter(pk=admin.pk).update(
+            role='user', claims_version=stale.claims_version + 1
+        )
+        cache.set(USER_CACHE_KEY.format(admin.pk), stale)
+
+        response = client.patch('/api/v1/users/me/', data={'bio': 'Новое'})
+        assert response.status_code == HTTPStatus.OK
+        admin.refresh_from_db()
+        assert admin.bio == 'Новое'
+        assert admin.role == 'user', (
+            'Проверьте, что PATCH-запрос к `/api/v1/users/me/` не '
+            'записывает в базу устаревшую роль из кеша.'
+        )
+        assert admin.claims_version == stale.claims_version + 1
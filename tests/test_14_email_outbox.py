@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14EmailOutbox:
+
+    def test_01_signup_email_is_queued(self, client, settings):
+        from users.models import OutboxEmail
+
+        settings.EMAIL_BACKEND = 'users.backends.OutboxEmailBackend'
+        settings.EMAIL_OUTBOX_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        data = {'email': 'valid@yamdb.fake', 'username': 'valid_username'}
+        response = client.post('/api/v1/auth/signup/', data=data)
+        assert response.status_code == HTTPStatus.OK
+        assert not mail.outbox, (
+            'Проверьте, что при регистрации письмо не отправляется в '
+            'обработчике запроса, а попадает в очередь.'
+        )
+        email = OutboxEmail.objects.get()
+        assert email.recipients == [data['email']]
+
+        call_command('send_emails')
+        assert [message.to for message in mail.outbox] == [[data['email']]], (
+            'Проверьте, что команда `send_emails` отправляет письма из '
+            'очереди.'
+        )
+        email.refresh_from_db()
+        assert email.sent_at is not None and email.attempts == 1
+
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что отправленные письма не отправляются повторно.'
+        )
+
+    def test_02_claimed_emails_are_not_sent_twice(self, settings):
+        from django.utils import timezone
+
+        from users.management.commands.send_emails import Command
+        from users.models import OutboxEmail
+
+        settings.EMAIL_OUTBOX_BACKEND = (
+            'django.core.mail.backends.locmem.EmailBackend'
+        )
+        OutboxEmail.objects.bulk_create(
+            OutboxEmail(subject='Код', body='12345', from_email='a@b.c',
+                        recipients=[f'user{number}@yamdb.fake'])
+            for number in range(3)
+        )
+        first, second = Command(), Command()
+        claimed = first.claim_batch(batch_size=2, max_attempts=5)
+        assert len(claimed) == 2
+        rest = second.claim_batch(batch_size=10, max_attempts=5)
+        assert len(rest) == 1 and rest[0] not in claimed, (
+            'Проверьте, что параллельный обработчик не берёт письма, уже '
+            'взятые другим.'
+        )
+        assert not second.claim_batch(batch_size=10, max_attempts=5)
+
+        OutboxEmail.objects.filter(pk=claimed[0].pk).update(
+            next_attempt_at=timezone.now()
+        )
+        call_command('send_emails')
+        assert len(mail.outbox) == 1, (
+            'Проверьте, что письмо упавшего обработчика возвращается в '
+            'очередь после истечения срока.'
+        )
@@ -0,0 +1,32 @@
+import json
+
+import pytest
+from django.core.management import call_command
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15Benchmark:
+
+    def test_01_seed_and_benchmark(self, tmp_path):
+        from reviews.models import Review, Title
+
+        call_command(
+            'seed_data', reviews=40, titles=4, comments=10
+        )
+        assert Review.objects.count() == 40
+        assert sum(
+            Title.objects.values_list('rating_count', flat=True)
+        ) == 40, (
+            'Проверьте, что `seed_data` пересчитывает рейтинги произведений.'
+        )
+
+        output = tmp_path / 'benchmark.json'
+        call_command('benchmark', repeat=2, warmup=0, output=str(output))
+        report = json.loads(output.read_text(encoding='utf8'))
+        assert report['meta']['rows']['review'] == 40
+        names = {result['name'] for result in report['results']}
+        assert {'titles-list', 'reviews-list', 'auth-signup'} <= names
+        for result in report['results']:
+            assert result['p50_ms'] <= result['p99_ms']
+            assert result['queries'] >= 0
+            assert result['allocated_bytes'] > 0
@@ -0,0 +1,135 @@
+import csv
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from tests.conftest import MANAGE_PATH
+
+CSV_DIR = Path(MANAGE_PATH, 'static', 'data')
+
+
+def count_rows(file):
+    with open(Path(CSV_DIR, file), encoding='utf8') as f:
+        return sum(1 for _ in csv.DictReader(f))
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16CsvImport:
+
+    @pytest.mark.parametrize('workers, batch_size, engine', (
+        (1, 7, 'sql'), (3, 1000, 'sql'), (3, 1000, 'orm')
+    ))
+    def test_01_import(self, workers, batch_size, engine):
+        from reviews.models import Comment, Genre_title, Review, Title
+
+        for _ in range(2):
+            call_command(
+                'csv_import', path=CSV_DIR, workers=workers,
+                batch_size=batch_size, engine=engine
+            )
+
+        for model, file in (
+            (Title, 'titles.csv'),
+            (Genre_title, 'genre_title.csv'),
+            (Review, 'review.csv'),
+            (Comment, 'comments.csv'),
+        ):
+            assert model.objects.count() == count_rows(file), (
+                'Проверьте, что `csv_import` загружает все строки из '
+                f'`{file}` и не дублирует их при повторном запуске.'
+            )
+        assert Title.objects.filter(rating_count__gt=0).exists()
+
+    def test_02_resume_and_verify(self):
+        from reviews.models import ImportCheckpoint, Review
+
+        with pytest.raises(CommandError):
+            call_command('csv_import', path=CSV_DIR, verify=True)
+
+        call_command('csv_import', path=CSV_DIR, batch_size=10)
+        checkpoint = ImportCheckpoint.objects.get(file='review.csv')
+        assert checkpoint.completed and checkpoint.rows == count_rows(
+            'review.csv'
+        )
+        call_command('csv_import', path=CSV_DIR, verify=True)
+
+        ImportCheckpoint.objects.filter(pk=checkpoint.pk).update(
+            rows=20, batches=2, completed=False
+        )
+        ImportCheckpoint.objects.filter(file='comments.csv').update(
+            rows=0, batches=0, completed=False
+        )
+        with open(Path(CSV_DIR, 'review.csv'), encoding='utf8') as f:
+            Review.objects.filter(
+                pk__in=[row['id'] for row in csv.DictReader(f)][20:]
+            ).delete()
+        call_command('csv_import', path=CSV_DIR, batch_size=10)
+        assert Review.objects.count() == count_rows('review.csv'), (
+            'Проверьте, что прерванная загрузка `csv_import` продолжается '
+            'с последней сохранённой пачки.'
+        )
+        call_command('csv_import', path=CSV_DIR, verify=True)
+
+        Review.objects.filter(pk=Review.objects.first().pk).update(score=11)
+        with pytest.raises(CommandError):
+            call_command('csv_import', path=CSV_DIR, verify=True)
+
+    def test_03_invalid_rows_skipped(self, tmp_path):
+        from reviews.models import Review
+
+        for file in Path(CSV_DIR).glob('*.csv'):
+            (tmp_path / file.name).write_bytes(file.read_bytes())
+        with open(Path(CSV_DIR, 'review.csv'), encoding='utf8') as f:
+            rows = list(csv.DictReader(f))
+        rows[0]['score'] = '11'
+        rows[1]['title_id'] = '100500'
+        rows[3]['title_id'] = rows[2]['title_id']
+        rows[3]['author'] = rows[2]['author']
+        with open(tmp_path / 'review.csv', 'w', encoding='utf8',
+                  newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        stderr = StringIO()
+        call_command('csv_import', path=tmp_path, stderr=stderr)
+        assert Review.objects.count() == len(rows) - 3, (
+            'Проверьте, что `csv_import` пропускает строки с недопустимой '
+            'оценкой, несуществующим внешним ключом и повтором уникального '
+            'значения.'
+        )
+        assert not Review.objects.filter(
+            pk__in=[rows[0]['id'], rows[1]['id'], rows[3]['id']]
+        ).exists()
+        assert 'строка 1' in stderr.getvalue()
+        assert 'строка 2' in stderr.getvalue()
+        assert 'строка 4' in stderr.getvalue(), (
+            'Проверьте, что `csv_import` сообщает номера пропущенных строк.'
+        )
+
+    def test_04_duplicate_ids_in_batch(self, tmp_path):
+        from reviews.models import Review
+
+        for file in Path(CSV_DIR).glob('*.csv'):
+            (tmp_path / file.name).write_bytes(file.read_bytes())
+        with open(Path(CSV_DIR, 'review.csv'), encoding='utf8') as f:
+            rows = list(csv.DictReader(f))
+        rows.append(dict(rows[0], text='Повтор'))
+        with open(tmp_path / 'review.csv', 'w', encoding='utf8',
+                  newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+        stderr = StringIO()
+        call_command(
+            'csv_import', path=tmp_path, engine='sql', stderr=stderr
+        )
+        assert Review.objects.count() == len(rows) - 1
+        assert Review.objects.get(pk=rows[0]['id']).text == rows[0]['text']
+        assert f'строка {len(rows)}: id: значение' in stderr.getvalue(), (
+            'Проверьте, что `csv_import` сообщает о повторе id внутри '
+            'одной пачки и оставляет первую строку.'
+        )
@@ -0,0 +1,70 @@
+import csv
+import json
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from tests.test_16_csv_import import CSV_DIR, count_rows
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17Export:
+
+    def test_01_export_command_round_trip(self, tmp_path):
+        from reviews.models import Comment, Review, Title
+
+        call_command('csv_import', path=CSV_DIR)
+        call_command('export_data', output=tmp_path)
+        call_command('export_data', output=tmp_path, file_format='ndjson')
+
+        with open(tmp_path / 'review.csv', encoding='utf8') as f:
+            rows = list(csv.DictReader(f))
+        assert len(rows) == count_rows('review.csv'), (
+            'Проверьте, что `export_data` выгружает все строки таблицы.'
+        )
+        assert set(rows[0]) == {
+            'id', 'title_id', 'text', 'author', 'score', 'pub_date'
+        }
+        with open(tmp_path / 'titles.ndjson', encoding='utf8') as f:
+            titles = [json.loads(line) for line in f]
+        assert len(titles) == Title.objects.count()
+        assert titles[0]['category'] == Title.objects.order_by(
+            'pk'
+        ).first().category_id
+
+        Comment.objects.all().delete()
+        Review.objects.all().delete()
+        call_command('csv_import', path=tmp_path, restart=True)
+        call_command('csv_import', path=tmp_path, verify=True)
+        assert Review.objects.count() == count_rows('review.csv'), (
+            'Проверьте, что выгрузку `export_data` можно загрузить обратно '
+            'командой `csv_import`.'
+        )
+
+    def test_02_export_endpoint(self, client, user_client, admin_client):
+        from reviews.models import Category
+
+        category = Category.objects.create(name='Фильмы', slug='movies')
+        url = '/api/v1/export/category.csv'
+        assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+        assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что выгрузка данных доступна только администратору.'
+        )
+
+        response = admin_client.get(url)
+        assert response.status_code == HTTPStatus.OK
+        assert response.streaming, (
+            'Проверьте, что выгрузка отдаётся потоком.'
+        )
+        assert response['Content-Type'].startswith('text/csv')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines == ['id,name,slug', f'{category.id},{category.name},'
+                         f'{category.slug}']
+
+        response = admin_client.get('/api/v1/export/category.ndjson')
+        content = b''.join(response.streaming_content).decode()
+        assert json.loads(content)['slug'] == category.slug
+
+        response = admin_client.get('/api/v1/export/unknown.csv')
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,146 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from tests.utils import create_reviews, create_titles
+
+
+def post_batch(client, url, items):
+    with CaptureQueriesContext(connection) as context:
+        response = client.post(url, data=items, format='json')
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18Batch:
+
+    def test_01_review_batch(self, admin_client, admin, user, moderator,
+                             django_user_model):
+        from reviews.models import Review, Title
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/batch/'
+        authors = [user, moderator] + [
+            django_user_model.objects.create_user(
+                username=f'partner{number}', email=f'p{number}@yamdb.fake'
+            )
+            for number in range(8)
+        ]
+
+        response, small = post_batch(admin_client, url, [
+            {'text': 'Отзыв', 'score': 4, 'author': author.username}
+            for author in authors[:2]
+        ])
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        url = f'/api/v1/titles/{titles[1]["id"]}/reviews/batch/'
+        response, large = post_batch(admin_client, url, [
+            {'text': f'Отзыв {index}', 'score': index + 1,
+             'author': author.username}
+            for index, author in enumerate(authors)
+        ])
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        assert small == large, (
+            'Проверьте, что пакетное создание отзывов выполняет одинаковое '
+            f'число SQL-запросов для 2 и 10 отзывов. Сейчас: {small} и '
+            f'{large}.'
+        )
+
+        data = response.json()
+        assert [item['author'] for item in data] == [
+            author.username for author in authors
+        ]
+        for item in data:
+            review = Review.objects.get(pk=item['id'])
+            assert (review.author.username, review.score) == (
+                item['author'], item['score']
+            ), 'Проверьте, что в ответе возвращаются id созданных отзывов.'
+        title = Title.objects.get(pk=titles[1]['id'])
+        assert (title.rating_sum, title.rating_count) == (55, 10), (
+            'Проверьте, что пакетное создание отзывов обновляет рейтинг '
+            'произведения.'
+        )
+
+    @pytest.mark.parametrize('items', (
+        [],
+        [{'text': 'Отзыв', 'score': 5}] * 101,
+        [{'text': 'Отзыв', 'score': 5}, {'text': 'Ещё отзыв', 'score': 6}],
+        [{'text': 'Отзыв', 'score': 11}],
+        [{'text': 'Отзыв', 'score': 5, 'author': 'TestAdmin'}],
+    ))
+    def test_02_review_batch_validation(self, admin_client, user_client,
+                                        items):
+        from reviews.models import Review
+
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/batch/'
+        response = user_client.post(url, data=items, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что некорректная пачка отзывов отклоняется целиком.'
+        )
+        assert not Review.objects.exists()
+
+    def test_03_existing_review(self, admin_client, admin, user,
+                                user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/batch/'
+        response = admin_client.post(url, data=[
+            {'text': 'Отзыв', 'score': 5, 'author': 'TestUser'}
+        ], format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST, (
+            'Проверьте, что пакетное создание не допускает второй отзыв '
+            'автора на то же произведение.'
+        )
+
+    def test_04_comment_batch(self, admin_client, admin, user,
+                              user_client):
+        from reviews.models import Comment
+
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        url = (
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/'
+            'comments/batch/'
+        )
+        items = [{'text': f'Комментарий {index}'} for index in range(5)]
+        assert APIClient().post(
+            url, data=items, format='json'
+        ).status_code == HTTPStatus.UNAUTHORIZED
+
+        response, small = post_batch(user_client, url, items[:2])
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        response, large = post_batch(user_client, url, items)
+        assert response.status_code == HTTPStatus.CREATED, response.json()
+        assert small == large, (
+            'Проверьте, что пакетное создание комментариев выполняет '
+            'одинаковое число SQL-запросов для 2 и 5 комментариев. '
+            f'Сейчас: {small} и {large}.'
+        )
+        for item in response.json():
+            comment = Comment.objects.get(pk=item['id'])
+            assert comment.text == item['text']
+            assert comment.author == user
+            assert item['author'] == user.username
+
+        other = f'/api/v1/titles/{titles[0]["id"]}/reviews/100500/comments/'
+        assert user_client.post(
+            f'{other}batch/', data=items, format='json'
+        ).status_code == HTTPStatus.NOT_FOUND
+
+    def test_05_oversized_batch_rejected_upfront(self, admin_client,
+                                                  user_client):
+        titles, _, _ = create_titles(admin_client)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/batch/'
+        response = user_client.post(
+            url, data=[{'score': 'плохо'}] * 1000, format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {
+            'non_field_errors': ['Передайте от 1 до 100 объектов.']
+        }, (
+            'Проверьте, что размер пачки проверяется до валидации '
+            'отдельных элементов.'
+        )
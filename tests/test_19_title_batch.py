@@ -0,0 +1,99 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_titles
+
+URL = '/api/v1/titles/batch/'
+
+
+def title_items(categories, genres, count):
+    return [
+        {
+            'name': f'Произведение {number}',
+            'year': 2000 + number % 20,
+            'description': 'Описание',
+            'category': categories[number % 2]['slug'],
+            'genre': [genre['slug'] for genre in genres[:number % 3 + 1]],
+        }
+        for number in range(count)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19TitleBatch:
+
+    def test_01_upsert(self, admin_client):
+        from reviews.models import Genre_title, Title
+
+        titles, categories, genres = create_titles(admin_client)
+        items = title_items(categories, genres, 3) + [
+            {
+                **titles[0],
+                'name': 'Терминатор 2',
+                'genre': [genres[2]['slug']],
+            },
+            {**titles[1], 'genre': ['unknown']},
+            {**titles[1], 'year': 3000},
+            {**titles[1], 'id': 100500},
+        ]
+
+        response = admin_client.post(URL, data=items, format='json')
+        assert response.status_code == HTTPStatus.OK, response.json()
+        results = response.json()
+        assert [result['index'] for result in results] == list(range(7))
+        assert [result['status'] for result in results] == [
+            'created', 'created', 'created', 'updated',
+            'error', 'error', 'error',
+        ], 'Проверьте, что для каждого элемента пачки возвращается результат.'
+        assert set(results[4]['errors']) == {'genre'}
+        assert set(results[5]['errors']) == {'year'}
+        assert set(results[6]['errors']) == {'id'}
+
+        assert Title.objects.count() == 5
+        for result, item in zip(results[:3], items):
+            title = Title.objects.get(pk=result['id'])
+            assert title.name == item['name']
+            assert sorted(title.genre.values_list('slug', flat=True)) == (
+                sorted(item['genre'])
+            ), 'Проверьте, что жанры созданных произведений сохраняются.'
+        updated = Title.objects.get(pk=titles[0]['id'])
+        assert updated.name == 'Терминатор 2'
+        assert list(updated.genre.values_list('slug', flat=True)) == [
+            genres[2]['slug']
+        ], 'Проверьте, что жанры обновлённого произведения заменяются.'
+        assert Genre_title.objects.filter(title=titles[1]['id']).count() == 1
+
+        response = admin_client.get('/api/v1/titles/')
+        assert response.json()['count'] == 5
+
+    def test_02_constant_queries(self, admin_client):
+        titles, categories, genres = create_titles(admin_client)
+        counts = []
+        for size in (2, 20):
+            items = title_items(categories, genres, size) + [
+                {**title, 'year': 1990} for title in titles
+            ]
+            with CaptureQueriesContext(connection) as context:
+                response = admin_client.post(URL, data=items, format='json')
+            assert response.status_code == HTTPStatus.OK
+            counts.append(len(context.captured_queries))
+        assert counts[0] == counts[1], (
+            'Проверьте, что пакетная загрузка произведений выполняет '
+            'одинаковое число SQL-запросов независимо от размера пачки. '
+            f'Сейчас: {counts}.'
+        )
+
+    @pytest.mark.parametrize('data', ([], {'name': 'Произведение'}))
+    def test_03_invalid_body(self, admin_client, data):
+        response = admin_client.post(URL, data=data, format='json')
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+
+    def test_04_permissions(self, user_client):
+        response = user_client.post(URL, data=[], format='json')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что пакетная загрузка произведений доступна только '
+            'администратору.'
+        )
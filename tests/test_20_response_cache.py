@@ -0,0 +1,73 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import count_queries, create_single_review, create_titles
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20ResponseCache:
+
+    def test_01_anonymous_hit(self, client, admin_client):
+        create_titles(admin_client)
+        url = '/api/v1/titles/?limit=5&offset=0'
+        assert client.get(url)['X-Cache'] == 'MISS'
+        assert count_queries(client, url) == 0, (
+            f'Проверьте, что повторный анонимный GET-запрос к `{url}` '
+            'отдаётся из кеша без обращений к базе.'
+        )
+        response = client.get('/api/v1/titles/?offset=0&limit=5')
+        assert response['X-Cache'] == 'HIT', (
+            'Проверьте, что ключ кеша не зависит от порядка параметров '
+            'запроса.'
+        )
+        assert response['Content-Type'] == 'application/json'
+        assert client.get('/api/v1/titles/?limit=1')['X-Cache'] == 'MISS'
+
+        response = admin_client.get(url)
+        assert 'X-Cache' not in response, (
+            'Проверьте, что запросы с токеном не кешируются.'
+        )
+
+    def test_02_invalidation(self, client, admin_client, user_client):
+        titles, categories, _ = create_titles(admin_client)
+        title_url = f'/api/v1/titles/{titles[0]["id"]}/'
+        assert client.get(title_url).json()['rating'] is None
+        assert client.get('/api/v1/categories/').json()['count'] == 2
+
+        create_single_review(user_client, titles[0]['id'], 'Отзыв', 7)
+        response = client.get(title_url)
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == 7, (
+            'Проверьте, что кеш произведения сбрасывается при появлении '
+            'отзыва.'
+        )
+
+        response = admin_client.delete(
+            f'/api/v1/categories/{categories[0]["slug"]}/'
+        )
+        assert response.status_code == HTTPStatus.NO_CONTENT
+        assert client.get('/api/v1/categories/').json()['count'] == 1
+        assert client.get(title_url).json()['category'] is None, (
+            'Проверьте, что кеш произведений сбрасывается при удалении '
+            'категории.'
+        )
+
+    def test_03_file_backend(self, client, admin_client, settings,
+                             tmp_path):
+        settings.CACHES = {
+            **settings.CACHES,
+            'responses': {
+                'BACKEND': (
+                    'django.core.cache.backends.filebased.FileBasedCache'
+                ),
+                'LOCATION': str(tmp_path),
+            },
+        }
+        create_titles(admin_client)
+        url = '/api/v1/genres/'
+        assert client.get(url)['X-Cache'] == 'MISS'
+        assert client.get(url)['X-Cache'] == 'HIT'
+        assert any(tmp_path.iterdir()), (
+            'Проверьте, что хранилище кеша ответов задаётся настройками.'
+        )
@@ -0,0 +1,89 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_review
+
+
+def conditional_get(client, url, **headers):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url, **headers)
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21ConditionalGet:
+
+    def test_01_etag(self, admin_client, admin, user, user_client,
+                     moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        reviews, titles = create_reviews(admin_client, author_map)
+        urls = (
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/{reviews[0]["id"]}/',
+            '/api/v1/categories/',
+            '/api/v1/users/',
+        )
+        for url in urls:
+            response = admin_client.get(url)
+            assert response.status_code == HTTPStatus.OK
+            assert response.has_header('ETag') and response.has_header(
+                'Last-Modified'
+            ), f'Проверьте, что ответ на GET-запрос к `{url}` содержит ETag.'
+            response, queries = conditional_get(
+                admin_client, url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+            assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+                f'Проверьте, что GET-запрос к `{url}` с актуальным '
+                '`If-None-Match` возвращает 304.'
+            )
+            assert not response.content
+            assert queries <= 1, (
+                f'Проверьте, что ответ 304 на GET-запрос к `{url}` не '
+                f'выполняет лишних SQL-запросов. Сейчас: {queries}.'
+            )
+
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = admin_client.get(url)['ETag']
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 3)
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что после изменения данных ETag меняется.'
+        )
+        assert len(response.json()['results']) == 3
+
+    def test_02_if_modified_since(self, client, admin_client, admin, user,
+                                  user_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        last_modified = client.get(url)['Last-Modified']
+
+        response = client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что GET-запрос с `If-Modified-Since` не раньше '
+            '`Last-Modified` возвращает 304.'
+        )
+        response = client.get(
+            url, HTTP_IF_MODIFIED_SINCE='Mon, 01 Jan 2001 00:00:00 GMT'
+        )
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_cached_response(self, client, admin_client, admin, user,
+                                user_client):
+        author_map = {admin: admin_client, user: user_client}
+        create_reviews(admin_client, author_map)
+        url = '/api/v1/titles/'
+        etag = client.get(url)['ETag']
+        response, queries = conditional_get(
+            client, url, HTTP_IF_NONE_MATCH=etag
+        )
+        assert response.status_code == HTTPStatus.NOT_MODIFIED
+        assert response['X-Cache'] == 'HIT' and queries == 0, (
+            'Проверьте, что кешированный ответ тоже учитывает '
+            '`If-None-Match`.'
+        )
+        assert not response.has_header('Content-Type')
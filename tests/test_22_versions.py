@@ -0,0 +1,130 @@
+from http import HTTPStatus
+
+import pytest
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22Versions:
+
+    def test_01_monotonic(self):
+        from api.versions import bump_versions, get_versions
+        from reviews.models import Title
+
+        scopes = ((Title, None), (Title, 1))
+        versions, _ = get_versions(scopes)
+        bump_versions(scopes[:1])
+        bumped, _ = get_versions(scopes)
+        assert bumped[0] > versions[0] and bumped[1] == versions[1], (
+            'Проверьте, что счётчик версий увеличивается только для '
+            'изменённой области.'
+        )
+
+    def test_02_parent_scope(self, admin_client, admin, user, user_client,
+                             moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        first_url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        second_url = f'/api/v1/titles/{titles[1]["id"]}/reviews/'
+        etags = [admin_client.get(url)['ETag'] for url in (first_url,
+                                                           second_url)]
+
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 3)
+        response = admin_client.get(second_url, HTTP_IF_NONE_MATCH=etags[1])
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что отзыв на одно произведение не меняет ETag '
+            'отзывов другого произведения.'
+        )
+        response = admin_client.get(first_url, HTTP_IF_NONE_MATCH=etags[0])
+        assert response.status_code == HTTPStatus.OK
+
+    def test_03_genre_links(self, client, admin_client, admin, user,
+                            user_client):
+        from reviews.models import Genre, Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        genre = Genre.objects.create(name='Новый жанр', slug='new-genre')
+        etag = client.get(url)['ETag']
+        Title.objects.get(pk=titles[0]['id']).genre.add(genre)
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что изменение жанров произведения меняет его ETag.'
+        )
+        genres = [genre['slug'] for genre in response.json()['genre']]
+        assert 'new-genre' in genres
+
+    def test_04_username_scope(self, client, admin_client, admin, user,
+                               user_client):
+        from users.models import User
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+        etag = admin_client.get(url)['ETag']
+
+        User.objects.filter(pk=user.pk).update(confirmation_code='12345')
+        response = client.post('/api/v1/auth/token/', data={
+            'username': user.username, 'confirmation_code': '12345'
+        })
+        assert response.status_code == HTTPStatus.OK
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что получение токена не меняет ETag отзывов.'
+        )
+
+        response = admin_client.patch(
+            f'/api/v1/users/{user.username}/', data={'username': 'renamed'}
+        )
+        assert response.status_code == HTTPStatus.OK
+        response = admin_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что смена username автора меняет ETag отзывов.'
+        )
+        assert 'renamed' in [
+            review['author'] for review in response.json()['results']
+        ]
+
+    def test_05_deploy_check(self, settings, tmp_path):
+        from api.checks import check_shared_version_cache
+
+        assert [
+            warning.id for warning in check_shared_version_cache(None)
+        ] == ['api.W001'], (
+            'Проверьте, что `check --deploy` предупреждает о счётчиках '
+            'версий в локальной памяти.'
+        )
+        settings.CACHES = {
+            **settings.CACHES,
+            'responses': {
+                'BACKEND': (
+                    'django.core.cache.backends.filebased.FileBasedCache'
+                ),
+                'LOCATION': str(tmp_path),
+            },
+        }
+        assert not check_shared_version_cache(None)
+
+    def test_06_bulk_commands(self, client, admin_client, admin, user,
+                              user_client):
+        from django.core.management import call_command
+
+        from reviews.models import Title
+
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/'
+        response = client.get(url)
+        rating, etag = response.json()['rating'], response['ETag']
+        assert client.get(url)['X-Cache'] == 'HIT'
+
+        Title.objects.filter(pk=titles[0]['id']).update(rating_sum=0)
+        call_command('recalculate_ratings')
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.OK, (
+            'Проверьте, что `recalculate_ratings` меняет ETag произведений.'
+        )
+        assert response['X-Cache'] == 'MISS'
+        assert response.json()['rating'] == rating
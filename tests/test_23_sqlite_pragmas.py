@@ -0,0 +1,73 @@
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+
+
+def read_pragmas(settings_dict, names):
+    from django.db.backends.sqlite3.base import DatabaseWrapper
+
+    fresh = DatabaseWrapper(settings_dict, alias='pragmas')
+    try:
+        with fresh.cursor() as cursor:
+            values = {}
+            for name in names:
+                cursor.execute(f'PRAGMA {name}')
+                values[name] = cursor.fetchone()[0]
+        return values
+    finally:
+        fresh.close()
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23SqlitePragmas:
+
+    def test_01_pragmas_on_connect(self, settings, tmp_path):
+        settings_dict = {
+            **connection.settings_dict, 'NAME': str(tmp_path / 'db.sqlite3')
+        }
+        names = ('journal_mode', 'synchronous', 'busy_timeout', 'temp_store')
+        settings.SQLITE_PRAGMAS = settings.SQLITE_PRAGMA_PROFILES[
+            'production'
+        ]
+        assert read_pragmas(settings_dict, names) == {
+            'journal_mode': 'wal',
+            'synchronous': 1,
+            'busy_timeout': 5000,
+            'temp_store': 2,
+        }, 'Проверьте, что настройки SQLite применяются к новому соединению.'
+
+        settings.SQLITE_PRAGMAS = settings.SQLITE_PRAGMA_PROFILES['stock']
+        assert read_pragmas(settings_dict, names) == {
+            'journal_mode': 'delete',
+            'synchronous': 2,
+            'busy_timeout': 5000,
+            'temp_store': 0,
+        }, 'Проверьте, что профиль `stock` возвращает настройки SQLite.'
+
+    def test_02_mixed_benchmark(self):
+        from api.management.commands.benchmark import (Command,
+                                                       run_mixed_worker)
+        from reviews.models import Comment
+
+        call_command('seed_data', reviews=10, titles=2, comments=5)
+        with pytest.raises(CommandError):
+            call_command(
+                'benchmark', repeat=1, warmup=0, endpoint=['titles-list'],
+                readers=1, writers=1, duration=0.1,
+            )
+
+        comment = Comment.objects.select_related('review').first()
+        title_url = f'/api/v1/titles/{comment.review.title_id}/'
+        write_url = f'{title_url}reviews/{comment.review_id}/comments/'
+        _, client = Command().get_client('benchmark_user', 'user')
+        authorization = client.defaults['HTTP_AUTHORIZATION']
+        comments = Comment.objects.count()
+        for kind in ('read', 'write'):
+            outcome_kind, timings, errors = run_mixed_worker(
+                kind, (title_url,), write_url, authorization, 0.2, 0
+            )
+            assert outcome_kind == kind and timings and not errors, (
+                'Проверьте, что процесс смешанной нагрузки выполняет запросы.'
+            )
+        assert Comment.objects.count() > comments
@@ -0,0 +1,92 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import caches
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+
+from tests.utils import create_reviews, create_single_review
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    monkeypatch.setitem(
+        settings.DATABASES, 'replica',
+        dict(connections['default'].settings_dict),
+    )
+    yield connections['replica']
+    del connections['replica']
+
+
+def count_queries(connection, client, method, url, **kwargs):
+    with CaptureQueriesContext(connection) as context:
+        response = getattr(client, method)(url, **kwargs)
+    return response, len(context.captured_queries)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24Replica:
+
+    def test_01_reads_from_replica(self, replica, admin_client, admin, user,
+                                   user_client, moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        urls = (
+            '/api/v1/titles/',
+            f'/api/v1/titles/{titles[0]["id"]}/',
+            f'/api/v1/titles/{titles[0]["id"]}/reviews/',
+            '/api/v1/genres/',
+        )
+        for url in urls:
+            response, queries = count_queries(
+                replica, moderator_client, 'get', url
+            )
+            assert response.status_code == HTTPStatus.OK
+            assert queries > 0, (
+                f'Проверьте, что GET-запрос к `{url}` читает из реплики.'
+            )
+
+        response, queries = count_queries(
+            replica, admin_client, 'post', '/api/v1/genres/',
+            data={'name': 'Жанр', 'slug': 'new-genre'},
+        )
+        assert response.status_code == HTTPStatus.CREATED
+        assert queries == 0, (
+            'Проверьте, что изменяющие запросы идут в основную базу.'
+        )
+
+    def test_02_read_your_writes(self, replica, client, admin_client, admin,
+                                 user, user_client, moderator_client):
+        author_map = {admin: admin_client, user: user_client}
+        _, titles = create_reviews(admin_client, author_map)
+        url = f'/api/v1/titles/{titles[0]["id"]}/reviews/'
+
+        create_single_review(moderator_client, titles[0]['id'], 'Отзыв', 3)
+        # Другой процесс или вытеснение: локальные кеши пусты.
+        for cache in caches.all():
+            cache.clear()
+        response, queries = count_queries(replica, moderator_client, 'get',
+                                          url)
+        assert response.status_code == HTTPStatus.OK
+        assert queries == 0, (
+            'Проверьте, что после записи пользователь читает из основной '
+            'базы.'
+        )
+        _, queries = count_queries(replica, client, 'get', url)
+        assert queries > 0, (
+            'Проверьте, что запись одного пользователя не переключает '
+            'остальных на основную базу.'
+        )
+
+    def test_03_router_without_replica(self):
+        from reviews.database import ReplicaRouter, replica_reads
+        from reviews.models import Title
+
+        token = replica_reads.set(True)
+        try:
+            assert ReplicaRouter().db_for_read(Title) == 'default', (
+                'Проверьте, что без настроенной реплики чтение идёт в '
+                'основную базу.'
+            )
+        finally:
+            replica_reads.reset(token)
@@ -0,0 +1,52 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.signals import request_started
+from django.db import connection
+
+URL = '/api/v1/metrics/connections/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25Connections:
+
+    def test_01_stats(self, admin_client, user_client):
+        response = user_client.get(URL)
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что статистика соединений доступна только '
+            'администратору.'
+        )
+        before = admin_client.get(URL).json()['databases']['default']
+        admin_client.get('/api/v1/titles/')
+        response = admin_client.get(URL)
+        assert response.status_code == HTTPStatus.OK
+        stats = response.json()
+        assert isinstance(stats['pid'], int)
+        after = stats['databases']['default']
+        assert set(after) == {
+            'conn_max_age', 'opened', 'reused', 'health_check_failures'
+        }
+        assert after['reused'] > before['reused'], (
+            'Проверьте, что переиспользование соединений учитывается.'
+        )
+
+    def test_02_health_check(self, monkeypatch):
+        from reviews.database import get_connection_stats
+
+        closed = []
+        connection.ensure_connection()
+        monkeypatch.setitem(connection.settings_dict, 'CONN_HEALTH_CHECKS',
+                            True)
+        monkeypatch.setattr(connection, 'is_usable', lambda: False)
+        monkeypatch.setattr(connection, 'close', lambda: closed.append(True))
+        before = get_connection_stats()['databases']['default']
+        request_started.send(sender=None)
+        after = get_connection_stats()['databases']['default']
+        assert closed, (
+            'Проверьте, что неработающее соединение закрывается перед '
+            'запросом.'
+        )
+        assert after['health_check_failures'] == (
+            before['health_check_failures'] + 1
+        )
+        assert after['reused'] == before['reused']
@@ -1,5 +1,8 @@
 from http import HTTPStatus
 
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
 check_name_and_slug_patterns = (
     (
         {
@@ -304,3 +307,27 @@ def check_fields(obj_type, url_pattern, obj, expected_data, detail=False):
         f'данные {obj_types[obj_type]}{results_in_msg}. Поле `id` не '
         'найдено или не является целым числом.'
     )
+
+
+def count_queries(client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = client.get(url)
+    assert response.status_code == HTTPStatus.OK, (
+        f'Проверьте, что GET-запрос к `{url}` возвращает ответ со '
+        'статусом 200.'
+    )
+    return len(context.captured_queries)
+
+
+def check_constant_queries(client, url, fill):
+    client.get(url)
+    fill()
+    queries_before = count_queries(client, url)
+    fill()
+    queries_after = count_queries(client, url)
+    assert queries_before == queries_after, (
+        f'Проверьте, что количество SQL-запросов при GET-запросе к `{url}` '
+        'не зависит от количества объектов на странице: было '
+        f'{queries_before}, стало {queries_after}.'
+    )
+    return queries_after